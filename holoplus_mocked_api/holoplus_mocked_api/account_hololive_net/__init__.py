@@ -1,16 +1,36 @@
 from __future__ import annotations
 
+import os
+import uuid
 from typing import Annotated, Any
 
 import urllib.parse
 
 import litestar
 from litestar import status_codes, Request
+from litestar.datastructures import Cookie
+from litestar.exceptions import ClientException
 from litestar.types import ControllerRouterHandler
 from litestar.response import Redirect, Response
 from litestar.params import Body, Parameter
 from litestar.openapi.spec import Example
 
+from holoplus_mocked_api.oauth import REDIRECT_URI, AuthFlowStore, AuthorizationRequest
+from holoplus_mocked_api.users import user_id_for_token
+from holoplus_mocked_api.v1.data import ME
+
+# Clients that are not signed in are signed in as the mocked `/v1/me` user, instead of being sent to the sign in page
+AUTO_SIGNIN = os.getenv("HOLOPLUS_AUTO_SIGNIN", default="1") == "1"
+
+ACCOUNT_COOKIE = "hololive_account"
+
+
+def _signed_in_user(request: Request[Any, Any, Any]) -> uuid.UUID | None:
+    try:
+        return uuid.UUID(request.cookies[ACCOUNT_COOKIE])
+    except (KeyError, ValueError):
+        return ME.id if AUTO_SIGNIN else None
+
 
 @litestar.get(
     "/account.hololive.net/v1/ep/auth",
@@ -30,24 +50,33 @@ async def v1_ep_auth(
     state_: Annotated[
         str, Parameter(query="state", examples=[Example(value="kMRJ2iYeaDYYDlJj13Azse6_GGbyZr1ZC5x5UvrfmIM=")])
     ] = "",
+    auth_flows: AuthFlowStore,
 ) -> Redirect:
     """
-    - Redirects to "https://api.holoplus.com/v2/auth/callback" if signed in
+    - Redirects to "https://api.holoplus.com/v2/auth/callback" with new authorization code if signed in
     - Redirects to "https://account.hololive.net/v1/signin" if not signed in
     """
-    if redirect_uri == "https://api.holoplus.com/v2/auth/callback":
-        redirect_uri = "/api.holoplus.com/v2/auth/callback"
-
-    # TODO: detect what user is signed in
-    logged_in = True
+    authorization_request = AuthorizationRequest(
+        client_id=client_id,
+        code_challenge=code_challenge,
+        code_challenge_method=code_challenge_method,
+        nonce=nonce,
+        redirect_uri=redirect_uri,
+        response_type=response_type,
+        scope=scope,
+        state=state_,
+    )
 
-    if logged_in:
-        query = urllib.parse.urlencode({"code": "some-auth-code", "state": state_})
-        url = f"{redirect_uri}?{query}"
-    else:
-        url = "/account.hololive.net/v1/signin"
+    user_id = _signed_in_user(request)
+    if user_id is None:
+        # TODO: verify query of the sign in page
+        query = urllib.parse.urlencode({"state": auth_flows.wait_for_signin(authorization_request)})
+        return Redirect(f"/account.hololive.net/v1/signin?{query}", status_code=status_codes.HTTP_302_FOUND)
 
-    return Redirect(url, status_code=status_codes.HTTP_302_FOUND)
+    if redirect_uri == REDIRECT_URI:
+        redirect_uri = "/v2/auth/callback"
+    query = urllib.parse.urlencode({"code": auth_flows.issue_code(authorization_request, user_id), "state": state_})
+    return Redirect(f"{redirect_uri}?{query}", status_code=status_codes.HTTP_302_FOUND)
 
 
 @litestar.get(
@@ -55,13 +84,26 @@ async def v1_ep_auth(
     summary="/account.hololive.net/v1/signin",
     media_type=litestar.MediaType.HTML,
 )
-async def v1_signin() -> Response:
-    """Returns hololive signin page"""
+async def v1_signin(
+    *,
+    state_: Annotated[str, Parameter(query="state")] = "",
+) -> Response:
+    """Returns hololive signin page, that signs in with mocked Google account"""
+    query = urllib.parse.urlencode(
+        {
+            "state": state_,
+            "code": "mocked-google-code",
+            "scope": "email profile openid",
+            "authuser": "0",
+            "prompt": "consent",
+        }
+    )
     return litestar.Response(
         media_type=litestar.MediaType.HTML,
-        # TODO: implement actual sign in page
-        #   Successful sign in should redirect to /account.hololive.net/v1/auth/google/callback
-        content="<h1>Sign in page</h1>",
+        content=(
+            "<h1>Sign in page</h1>"
+            f'<a href="/account.hololive.net/v1/auth/google/callback?{query}">Sign in with Google</a>'
+        ),
     )
 
 
@@ -69,6 +111,7 @@ async def v1_signin() -> Response:
     "/account.hololive.net/v1/auth/google/callback",
     summary="/account.hololive.net/v1/auth/google/callback",
     status_code=status_codes.HTTP_302_FOUND,
+    raises=[ClientException],
 )
 async def v1_auth_google_callback(
     request: Request[Any, Any, Any],
@@ -102,32 +145,36 @@ async def v1_auth_google_callback(
     ],
     authuser: Annotated[str, Parameter(examples=[Example(value="0")])],
     prompt: Annotated[str, Parameter(examples=[Example(value="consent")])],
+    auth_flows: AuthFlowStore,
 ) -> Redirect:
     """
     If successful, redirects to the original `/v1/ep/auth/**` url that started the signin process.
+    Every Google `code` is a different account.
     """
-    # TODO: replace placeholder values with real ones from storage
-    query = urllib.parse.urlencode(
-        {
-            "client_id": "???",
-            "code_challenge": "???",
-            "code_challenge_method": "S256",
-            "nonce": "???",
-            "redirect_uri": "/api.holoplus.com/v2/auth/callback",
-            "response_type": "code",
-            "scope": "openid+profile",
-            "state": "???",
-        }
-    )
-    url = f"/v1/ep/auth?{query}"
+    authorization_request = auth_flows.finish_signin(state_)
+    if authorization_request is None:
+        # TODO: verify error format
+        raise ClientException(detail="invalid or expired sign-in state")
 
-    return Redirect(url, status_code=status_codes.HTTP_302_FOUND)
+    return Redirect(
+        f"/account.hololive.net/v1/ep/auth?{authorization_request.query()}",
+        status_code=status_codes.HTTP_302_FOUND,
+        cookies=[
+            Cookie(
+                key=ACCOUNT_COOKIE,
+                value=str(user_id_for_token(ME, code)),
+                path="/account.hololive.net",
+                httponly=True,
+            )
+        ],
+    )
 
 
 ROUTES: list[ControllerRouterHandler] = [
     litestar.Router(
         "",
         tags=["account.hololive.net"],
+        opt={"exclude_from_auth": True},
         route_handlers=[
             v1_ep_auth,
             v1_signin,
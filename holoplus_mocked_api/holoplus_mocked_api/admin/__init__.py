@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import os
+from typing import Annotated
+
+import litestar
+from litestar.params import Body
+from litestar.types import ControllerRouterHandler
+
+from holoplus_mocked_api.clock import ClockState, VirtualClock
+
+from .models import ClockUpdateRequest
+
+# Serve the `/_admin` endpoints, only for testing: they are not part of the Holoplus API and don't need auth,
+# so any client can e.g. move the server-wide virtual time
+ADMIN = os.getenv("HOLOPLUS_ADMIN", default="0") == "1"
+
+
+@litestar.get("/_admin/clock", summary="/_admin/clock")
+async def admin__clock(*, clock: VirtualClock) -> ClockState:
+    """Virtual time of the mocked server"""
+    return clock.state()
+
+
+@litestar.put("/_admin/clock", summary="/_admin/clock")
+async def admin__clock__put(data: Annotated[ClockUpdateRequest, Body()], *, clock: VirtualClock) -> ClockState:
+    """
+    Moves, pauses, resumes or speeds up the virtual time, omitted values are kept.
+    Not part of the Holoplus API, only for testing clients against time-dependent data.
+    """
+    clock.set(at=data.time, offset=data.offset, speed=data.speed, paused=data.paused)
+    return clock.state()
+
+
+ROUTES: list[ControllerRouterHandler] = [
+    litestar.Router(
+        "",
+        tags=["admin"],
+        opt={"exclude_from_auth": True},
+        route_handlers=[
+            admin__clock,
+            admin__clock__put,
+        ],
+    ),
+]
@@ -0,0 +1,14 @@
+from __future__ import annotations
+
+from typing import Annotated
+
+import msgspec
+
+
+class ClockUpdateRequest(msgspec.Struct, kw_only=True):
+    time: Annotated[float | None, msgspec.Meta(examples=[1757169645.0])] = msgspec.field(default=None)
+    """Virtual time to jump to, takes precedence over `offset`"""
+    offset: Annotated[float | None, msgspec.Meta(examples=[-3600.0])] = msgspec.field(default=None)
+    """Virtual time relative to real time"""
+    speed: Annotated[float, msgspec.Meta(gt=0, examples=[60.0])] | None = msgspec.field(default=None)
+    paused: Annotated[bool | None, msgspec.Meta(examples=[False])] = msgspec.field(default=None)
@@ -1,23 +1,116 @@
 from __future__ import annotations
 
+import logging
+import os
+import pathlib
+from typing import cast
+
 import litestar
 import litestar.openapi
+from litestar.config.compression import CompressionConfig
+from litestar.datastructures import State
+from litestar.di import Provide
 from litestar.exceptions import HTTPException, NotFoundException
+from litestar.logging import LoggingConfig
+from litestar.middleware import DefineMiddleware
+from litestar.openapi.spec import Components, SecurityScheme
 
 from .account_hololive_net import ROUTES as ACCOUNT_HOLOLIVE_NET_ROUTES
+from .admin import ADMIN
+from .admin import ROUTES as ADMIN_ROUTES
+from .auth import AuthenticationMiddleware
+from .bundle import BUNDLE_PATH, SHARED_BUNDLE, Bundle, fingerprint
+from .clock import CLOCK_PAUSED, CLOCK_SPEED, CLOCK_START, VirtualClock, provide_clock
+from .compression import CompressionBackend, CompressionMiddleware, available_backend, compression_encodings
 from .exceptions import HoloplusException, exception_handler, litestar_monkey_patch, root_exception_handler
+from .fixtures import FixtureRoute, FixtureStore, provide_fixture_store
 from .googleapis_com import ROUTES as GOOGLEAPIS_COM_ROUTES
+from .oauth import AUTH_FLOWS_MAXSIZE, AuthFlowStore, provide_auth_flow_store
+from .reload import WATCH_FIXTURES, FixtureWatcher
+from .responses import ETagResponse
+from .tokens import TokenIssuer, provide_token_issuer
+from .users import SESSIONS_MAXSIZE, UserDirectory, provide_user_directory
+from .v1 import FIXTURE_ROUTES as V1_FIXTURE_ROUTES
 from .v1 import ROUTES as V1_ROUTES
+from .v1.data import ME
+from .v2 import FIXTURE_ROUTES as V2_FIXTURE_ROUTES
 from .v2 import ROUTES as V2_ROUTES
 from .v3 import ROUTES as V3_ROUTES
+from .v4 import FIXTURE_ROUTES as V4_FIXTURE_ROUTES
 from .v4 import ROUTES as V4_ROUTES
+from .v4.pins.store import PinStore, provide_pin_store
+from .v4.reactions.counters import ReactionCounters, provide_reaction_counters
+from .v4.stream_events.schedule import StreamSchedule, capture_time, provide_stream_schedule, stream_events_data
+from .v4.threads.favorites import FavoritesStore, provide_favorites_store
+from .v5 import FIXTURE_ROUTES as V5_FIXTURE_ROUTES
 from .v5 import ROUTES as V5_ROUTES
 
+_logger = logging.getLogger(__name__)
+
+# Return fixtures as JSON bytes encoded once on startup, instead of encoding the structs on every request
+ENCODED_RESPONSES = os.getenv("HOLOPLUS_ENCODED_RESPONSES", default="0") == "1"
+
+# Compress responses with "gzip" or "brotli" (needs `litestar[brotli]`); fixtures are compressed once on startup
+COMPRESSION = cast("CompressionBackend | None", os.getenv("HOLOPLUS_COMPRESSION") or None)
+
+FIXTURE_ROUTES: list[FixtureRoute] = [*V1_FIXTURE_ROUTES, *V2_FIXTURE_ROUTES, *V4_FIXTURE_ROUTES, *V5_FIXTURE_ROUTES]
+
 
-def create_app() -> litestar.Litestar:
+def create_app(
+    *,
+    encoded_responses: bool = ENCODED_RESPONSES,
+    compression: CompressionBackend | None = COMPRESSION,
+    precompress: bool = True,
+    bundle_path: pathlib.Path | None = BUNDLE_PATH,
+    shared_bundle: bool = SHARED_BUNDLE,
+    watch_fixtures: bool = WATCH_FIXTURES,
+    admin: bool = ADMIN,
+    clock_start: str | None = CLOCK_START,
+    clock_speed: float = CLOCK_SPEED,
+    clock_paused: bool = CLOCK_PAUSED,
+    sessions_maxsize: int = SESSIONS_MAXSIZE,
+    auth_flows_maxsize: int = AUTH_FLOWS_MAXSIZE,
+) -> litestar.Litestar:
     litestar_monkey_patch()
-    return litestar.Litestar(
+
+    compression = available_backend(compression)
+    encodings = compression_encodings(compression) if precompress else ()
+    bundle: Bundle | None
+    if shared_bundle:
+        bundle = Bundle.open_shared(FIXTURE_ROUTES, compression_encodings=encodings)
+    else:
+        bundle = Bundle.open(bundle_path) if bundle_path else None
+        if bundle is not None and bundle.fingerprint != fingerprint(FIXTURE_ROUTES, bundle.compression_encodings):
+            _logger.warning("Ignoring fixtures bundle %s built from other data files, rebuild it", bundle.path)
+            bundle = None
+    fixture_store = FixtureStore.load(
+        FIXTURE_ROUTES,
+        encoded=encoded_responses,
+        compression_encodings=encodings,
+        bundle=bundle,
+    )
+
+    start: float | None
+    if clock_start is None:
+        stream_event_items, stream_event_details = stream_events_data(fixture_store)
+        start = capture_time([*stream_event_items, *stream_event_details.values()])
+    elif clock_start == "now":
+        start = None
+    else:
+        start = float(clock_start)
+    clock = VirtualClock(start=start, speed=clock_speed, paused=clock_paused)
+    token_issuer = TokenIssuer(clock)
+    users = UserDirectory(ME, maxsize=sessions_maxsize, tokens=token_issuer)
+    stream_schedule = StreamSchedule.from_store(fixture_store, clock=clock)
+
+    middleware: list[DefineMiddleware] = [DefineMiddleware(AuthenticationMiddleware, exclude=["^/schema"])]
+    if compression:
+        # added as regular middleware, because `compression_config` always uses Litestar's `CompressionMiddleware`
+        middleware.append(DefineMiddleware(CompressionMiddleware, config=CompressionConfig(backend=compression)))
+
+    app = litestar.Litestar(
         route_handlers=[
+            *(ADMIN_ROUTES if admin else []),
             *ACCOUNT_HOLOLIVE_NET_ROUTES,
             *GOOGLEAPIS_COM_ROUTES,
             *V1_ROUTES,
@@ -30,6 +123,12 @@ def create_app() -> litestar.Litestar:
             title="Holoplus API (Mocked)",
             version="3.0.0",
             use_handler_docstrings=True,
+            components=Components(
+                security_schemes={
+                    "authorization": SecurityScheme(type="apiKey", name="authorization", security_scheme_in="header")
+                }
+            ),
+            security=[{"authorization": []}],
         ),
         exception_handlers={
             Exception: exception_handler,
@@ -37,4 +136,50 @@ def create_app() -> litestar.Litestar:
             HoloplusException: exception_handler,
             NotFoundException: root_exception_handler,
         },
+        dependencies={
+            "fixtures": Provide(provide_fixture_store, sync_to_thread=False),
+            "favorites": Provide(provide_favorites_store, sync_to_thread=False),
+            "reactions": Provide(provide_reaction_counters, sync_to_thread=False),
+            "pins": Provide(provide_pin_store, sync_to_thread=False),
+            "schedule": Provide(provide_stream_schedule, sync_to_thread=False),
+            "clock": Provide(provide_clock, sync_to_thread=False),
+            "users": Provide(provide_user_directory, sync_to_thread=False),
+            "tokens": Provide(provide_token_issuer, sync_to_thread=False),
+            "auth_flows": Provide(provide_auth_flow_store, sync_to_thread=False),
+        },
+        state=State(
+            {
+                "clock": clock,
+                "fixture_store": fixture_store,
+                "user_directory": users,
+                "token_issuer": token_issuer,
+                "auth_flow_store": AuthFlowStore(maxsize=auth_flows_maxsize),
+                "favorites_store": FavoritesStore(users),
+                "reaction_counters": ReactionCounters(users),
+                "pin_store": PinStore(users),
+                "stream_schedule": stream_schedule,
+            }
+        ),
+        response_class=ETagResponse,
+        middleware=middleware,
+        lifespan=(
+            [FixtureWatcher(fixture_store, FIXTURE_ROUTES, on_reload=[stream_schedule.reload]).lifespan]
+            if watch_fixtures
+            else []
+        ),
+        logging_config=LoggingConfig(
+            loggers={
+                "holoplus_mocked_api": {"level": "INFO", "handlers": ["queue_listener"], "propagate": False},
+            },
+        ),
+    )
+
+    _logger.info(
+        "Loaded %s fixtures in %.3fs (%s more indexed for lazy loading) from %s",
+        len(fixture_store),
+        fixture_store.load_time,
+        fixture_store.lazy_count,
+        bundle.path if bundle else "data files",
     )
+
+    return app
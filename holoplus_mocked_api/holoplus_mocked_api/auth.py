@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+import uuid
+
+from litestar import Request
+from litestar.connection import ASGIConnection
+from litestar.datastructures import State
+from litestar.middleware import AbstractAuthenticationMiddleware, AuthenticationResult
+
+from .exceptions import HoloplusMissingTokenException
+from .users import UserDirectory
+
+
+class AuthenticationMiddleware(AbstractAuthenticationMiddleware):
+    """
+    Resolves the `authorization` token of every request to its user once, before the handler is called,
+    so handlers get the user id from `request.user` (see `AuthRequest`) instead of parsing the header themselves.
+
+    Missing token is rejected with `HoloplusMissingTokenException`, and invalid or expired token minted
+    by `TokenIssuer` with `HoloplusInvalidTokenException` (verified claims are cached by the issuer).
+    Endpoints that don't need the header are excluded with `exclude_from_auth=True`.
+    """
+
+    async def authenticate_request(self, connection: ASGIConnection) -> AuthenticationResult:
+        # raw headers, so that `Headers` are not parsed for endpoints that don't use them
+        token = next(
+            (value.decode("latin-1") for name, value in connection.scope["headers"] if name == b"authorization"), None
+        )
+        if not token:
+            raise HoloplusMissingTokenException()
+
+        users: UserDirectory = connection.app.state.user_directory
+        return AuthenticationResult(user=users.user_id(token), auth=token)
+
+
+AuthRequest = Request[uuid.UUID, str, State]
+"""Request of authenticated endpoint, `request.user` is the user id and `request.auth` the token"""
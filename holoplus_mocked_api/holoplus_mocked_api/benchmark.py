@@ -0,0 +1,372 @@
+# ruff: noqa: T201
+"""
+Micro-benchmarks of the mocked API.
+
+Requests are sent directly to the ASGI app (no HTTP server or client), so the results show mainly the time spent
+in Litestar and in the handlers.
+
+Run with `python -m holoplus_mocked_api.benchmark --help`
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import math
+import pathlib
+import tempfile
+import time
+import tracemalloc
+import urllib.parse
+import uuid
+from typing import Annotated, Any, Callable
+
+import litestar
+import msgspec
+from litestar.datastructures import State
+from litestar.di import Provide
+from litestar.middleware import DefineMiddleware
+from litestar.params import Parameter
+
+from .app import FIXTURE_ROUTES, create_app
+from .auth import AuthenticationMiddleware, AuthRequest
+from .bundle import BUNDLE_PATH, Bundle, build_bundle
+from .clock import VirtualClock
+from .fixtures import FixtureStore
+from .oauth import AuthFlowStore
+from .tokens import TokenIssuer
+from .users import UserDirectory, provide_user_directory
+from .v1.data import ME
+from .v2.models import AuthResponse
+from .v4.reactions.counters import ReactionCounters
+
+HEADERS = {"authorization": "Bearer benchmark"}
+
+ENCODED_RESPONSES_PATHS = [
+    "/v1/me",
+    "/v2/modules",
+    "/v2/banners",
+    "/v2/units/ebe86ce6-0013-46ff-b787-b1e49a6a1bcb",
+    "/v5/threads/e1272fb1-38bc-4e29-aeb8-f8a9443c3340",
+    "/v4/stream_events?plan=past&fav_talent_filter=false",
+    "/v4/talent-channel/threads/newest?channel_id=7f237193-e0f7-4127-af78-9f5c255069ac",
+]
+
+COMPRESSION_PATHS = [
+    "/v4/stream_events?plan=past&fav_talent_filter=false",
+    "/v4/stream_events?plan=future&fav_talent_filter=false",
+    "/v4/talent-channel/threads/newest?channel_id=7f237193-e0f7-4127-af78-9f5c255069ac",
+    "/v4/talent-channel/comments/popular?thread_id=c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2",
+    "/v2/modules",
+]
+
+
+async def asgi_request(
+    app: litestar.Litestar,
+    url: str,
+    *,
+    method: str = "GET",
+    headers: dict[str, str] | None = None,
+    body: bytes = b"",
+) -> tuple[int, dict[str, str], bytes]:
+    """Sends single request to ASGI app and returns status code, headers and body"""
+    path, _, query = url.partition("?")
+    scope: dict[str, Any] = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()],
+        "server": ("testserver", 80),
+        "client": ("127.0.0.1", 12345),
+        "state": {},
+    }
+
+    status_code = 0
+    response_headers: dict[str, str] = {}
+    response_body = bytearray()
+
+    async def receive() -> dict[str, Any]:
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            response_headers.update((k.decode(), v.decode()) for k, v in message.get("headers", []))
+        elif message["type"] == "http.response.body":
+            response_body.extend(message.get("body", b""))
+
+    await app(scope, receive, send)  # type: ignore[arg-type]
+    return status_code, response_headers, bytes(response_body)
+
+
+async def measure(
+    app: litestar.Litestar, urls: list[str], *, repeat: int, headers: dict[str, str] | None = None
+) -> float:
+    """Returns average time per request in microseconds"""
+    headers = headers or HEADERS
+
+    # warm up, and make sure that all urls work
+    for url in urls:
+        status_code, _, _ = await asgi_request(app, url, headers=headers)
+        if status_code >= 400:
+            raise RuntimeError(f"Request failed: {url} -> {status_code}")
+
+    start = time.process_time()
+    for _ in range(repeat):
+        for url in urls:
+            await asgi_request(app, url, headers=headers)
+    return (time.process_time() - start) / (repeat * len(urls)) * 1_000_000
+
+
+async def benchmark_encoded_responses(repeat: int) -> None:
+    """Compares returning fixture structs with returning fixtures pre-encoded to JSON"""
+    struct_app = create_app(encoded_responses=False)
+    encoded_app = create_app(encoded_responses=True)
+
+    print(f"{'path':<90} {'struct':>10} {'encoded':>10} {'speedup':>8}")
+    for url in ENCODED_RESPONSES_PATHS:
+        _, _, struct_body = await asgi_request(struct_app, url, headers=HEADERS)
+        _, _, encoded_body = await asgi_request(encoded_app, url, headers=HEADERS)
+        if struct_body != encoded_body:
+            raise RuntimeError(f"Encoded response differs: {url}")
+
+        struct_time = await measure(struct_app, [url], repeat=repeat)
+        encoded_time = await measure(encoded_app, [url], repeat=repeat)
+        print(
+            f"{url:<90} {struct_time:>8.1f}us {encoded_time:>8.1f}us {struct_time / encoded_time:>7.2f}x",
+        )
+
+
+async def benchmark_etag(repeat: int) -> None:
+    """Compares full responses with `304 Not Modified` responses to requests with matching `If-None-Match`"""
+    app = create_app()
+
+    print(f"{'path':<90} {'200':>10} {'304':>10} {'speedup':>8}")
+    for url in ENCODED_RESPONSES_PATHS:
+        _, headers, _ = await asgi_request(app, url, headers=HEADERS)
+        cached_headers = {**HEADERS, "if-none-match": headers["etag"]}
+        status_code, _, body = await asgi_request(app, url, headers=cached_headers)
+        if status_code != 304 or body:
+            raise RuntimeError(f"Expected empty 304 response: {url} -> {status_code}")
+
+        full_time = await measure(app, [url], repeat=repeat)
+        cached_time = await measure(app, [url], repeat=repeat, headers=cached_headers)
+        print(f"{url:<90} {full_time:>8.1f}us {cached_time:>8.1f}us {full_time / cached_time:>7.2f}x")
+
+
+async def benchmark_compression(repeat: int) -> None:
+    """Compares bytes on wire and CPU time of uncompressed, compressed on request and precompressed responses"""
+    apps = {
+        "none": create_app(compression=None),
+        "gzip": create_app(compression="gzip", precompress=False),
+        "gzip-pre": create_app(compression="gzip", precompress=True),
+    }
+    headers = {**HEADERS, "accept-encoding": "gzip"}
+
+    print(f"{'path':<90} " + " ".join(f"{name:>21}" for name in apps))
+    for url in COMPRESSION_PATHS:
+        results = []
+        for app in apps.values():
+            _, _, body = await asgi_request(app, url, headers=headers)
+            request_time = await measure(app, [url], repeat=repeat, headers=headers)
+            results.append(f"{len(body):>9}B {request_time:>8.1f}us")
+        print(f"{url:<90} " + " ".join(results))
+
+
+async def benchmark_bundle(repeat: int) -> None:
+    """Compares loading fixtures from loose data files and from memory-mapped bundle"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        bundle_path = pathlib.Path(tmp_dir) / BUNDLE_PATH.name
+        build_bundle(FIXTURE_ROUTES, bundle_path)
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            FixtureStore.load(FIXTURE_ROUTES)
+        files_time = (time.perf_counter() - start) / repeat * 1000
+
+        start = time.perf_counter()
+        for _ in range(repeat):
+            FixtureStore.load(FIXTURE_ROUTES, bundle=Bundle.open(bundle_path))
+        bundle_time = (time.perf_counter() - start) / repeat * 1000
+
+    print(f"{'files':>10} {'bundle':>10} {'speedup':>8}")
+    print(f"{files_time:>8.2f}ms {bundle_time:>8.2f}ms {files_time / bundle_time:>7.2f}x")
+
+
+async def benchmark_reactions(repeat: int) -> None:
+    """Reports reactions per second applied to counters directly and through the endpoint"""
+    users = 8
+    record_ids = [uuid.uuid4() for _ in range(256)]
+    user_ids = [uuid.uuid4() for _ in range(users)]
+
+    print(f"{'counters':<30} {'reactions':>10} {'reactions/s':>12}")
+    counters = ReactionCounters(UserDirectory(ME))
+    start = time.perf_counter()
+    for i in range(repeat):
+        counters.react(record_ids[i % len(record_ids)], user_ids[i % users])
+    duration = time.perf_counter() - start
+
+    total = sum(counters.total(record_id) for record_id in record_ids)
+    if total != repeat:
+        raise RuntimeError(f"Lost reactions: {total}")
+    print(f"{f'ReactionCounters, {users} users':<30} {total:>10} {total / duration:>12.0f}")
+
+    app = create_app()
+    body = b'{"reaction_count": 1, "target_type": "comment"}'
+    start = time.perf_counter()
+    for i in range(repeat):
+        url = f"/v4/reactions/contents/{record_ids[i % len(record_ids)]}"
+        status_code, _, _ = await asgi_request(app, url, method="POST", headers=HEADERS, body=body)
+        if status_code != 204:
+            raise RuntimeError(f"Request failed: {url} -> {status_code}")
+    duration = time.perf_counter() - start
+    print(f"{'POST /v4/reactions/contents':<30} {repeat:>10} {repeat / duration:>12.0f}")
+
+
+async def benchmark_sessions(repeat: int) -> None:
+    """Reports traced memory while every request comes from new user, with sessions limited to 1/10 of the users"""
+    sessions_maxsize = max(1, repeat // 10)
+    app = create_app(sessions_maxsize=sessions_maxsize)
+    users: UserDirectory = app.state.user_directory
+    thread_url = "/v4/threads/c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2/favorite"
+
+    tracemalloc.start()
+    print(f"{'users':>10} {'sessions':>10} {'evictions':>10} {'memory':>10}")
+    for i in range(repeat):
+        headers = {"authorization": f"Bearer user{i}"}
+        status_code, _, _ = await asgi_request(app, thread_url, method="POST", headers=headers)
+        if status_code != 201:
+            raise RuntimeError(f"Request failed: {thread_url} -> {status_code}")
+        await asgi_request(app, "/v1/me", headers=headers)
+
+        if (i + 1) % max(1, repeat // 5) == 0:
+            memory, _ = tracemalloc.get_traced_memory()
+            print(f"{i + 1:>10} {len(users):>10} {users.evictions:>10} {memory / 1024 / 1024:>8.2f}MB")
+    tracemalloc.stop()
+
+
+@litestar.get("/none", sync_to_thread=False)
+def _auth_none(users: UserDirectory) -> bool:
+    return users.get(ME.id) is users.get(ME.id)
+
+
+@litestar.get("/header", sync_to_thread=False)
+def _auth_header(token: Annotated[str, Parameter(header="authorization")], users: UserDirectory) -> bool:
+    # every store resolved the token on its own before `AuthenticationMiddleware`
+    return users.get(users.user_id(token)) is users.get(users.user_id(token))
+
+
+@litestar.get("/middleware", sync_to_thread=False)
+def _auth_middleware(request: AuthRequest, users: UserDirectory) -> bool:
+    return users.get(request.user) is users.get(request.user)
+
+
+async def benchmark_auth(repeat: int) -> None:
+    """
+    Compares resolving the user from `authorization` header parameter in handler with resolving it once
+    in `AuthenticationMiddleware`, for minted JWT and opaque token. Handlers read state of the user from two stores
+    (like `/v4/threads/{thread_id}/contents`), overhead is the time over handler without authentication.
+
+    Both are within noise of each other: the middleware doesn't make requests faster, it only resolves
+    and rejects tokens in one place for all handlers.
+    """
+    token_issuer = TokenIssuer(VirtualClock())
+    users = UserDirectory(ME, tokens=token_issuer)
+    dependencies = {"users": Provide(provide_user_directory, sync_to_thread=False)}
+    apps = {
+        "/none": litestar.Litestar(
+            route_handlers=[_auth_none], dependencies=dependencies, state=State({"user_directory": users})
+        ),
+        "/header": litestar.Litestar(
+            route_handlers=[_auth_header], dependencies=dependencies, state=State({"user_directory": users})
+        ),
+        "/middleware": litestar.Litestar(
+            route_handlers=[_auth_middleware],
+            dependencies=dependencies,
+            middleware=[DefineMiddleware(AuthenticationMiddleware)],
+            state=State({"user_directory": users}),
+        ),
+    }
+
+    tokens = {"jwt": f"Bearer {token_issuer.mint(uuid.uuid4())}", "opaque": "Bearer benchmark"}
+    print(f"{'token':<10} {'none':>10} {'header':>10} {'middleware':>12} {'+header':>10} {'+middleware':>12}")
+    for name, token in tokens.items():
+        headers = {"authorization": token}
+        # best of interleaved rounds, because the differences are small compared to the noise
+        times = dict.fromkeys(apps, math.inf)
+        for _ in range(20):
+            for url, app in apps.items():
+                times[url] = min(times[url], await measure(app, [url], repeat=max(1, repeat // 20), headers=headers))
+        none_time, header_time, middleware_time = times.values()
+        print(
+            f"{name:<10} {none_time:>8.1f}us {header_time:>8.1f}us {middleware_time:>10.1f}us"
+            f" {header_time - none_time:>8.1f}us {middleware_time - none_time:>10.1f}us"
+        )
+
+
+async def benchmark_auth_flows(repeat: int) -> None:
+    """
+    Reports sign-in flows per second and traced memory while every other flow is abandoned after `/v2/auth`,
+    with pending flows limited to 1/10 of the flows
+    """
+    app = create_app(auth_flows_maxsize=max(1, repeat // 10))
+    auth_flows: AuthFlowStore = app.state.auth_flow_store
+
+    tracemalloc.start()
+    print(f"{'flows':>10} {'pending':>10} {'evictions':>10} {'memory':>10}")
+    start = time.perf_counter()
+    for i in range(repeat):
+        _, _, body = await asgi_request(app, "/v2/auth")
+        auth = msgspec.json.decode(body, type=AuthResponse)
+
+        if i % 2 == 0:
+            url = auth.url.replace("https://account.hololive.net", "/account.hololive.net")
+            _, headers, _ = await asgi_request(app, url)
+            query = dict(urllib.parse.parse_qsl(urllib.parse.urlsplit(headers["location"]).query))
+            body = msgspec.json.encode({"code": query["code"], "session_id": auth.session_id, "state": query["state"]})
+            status_code, _, _ = await asgi_request(app, "/v2/auth/token", method="POST", body=body)
+            if status_code != 200:
+                raise RuntimeError(f"Sign-in failed: {status_code}")
+
+        if (i + 1) % max(1, repeat // 5) == 0:
+            memory, _ = tracemalloc.get_traced_memory()
+            evictions = auth_flows.sessions.evictions + auth_flows.codes.evictions
+            print(f"{i + 1:>10} {len(auth_flows):>10} {evictions:>10} {memory / 1024 / 1024:>8.2f}MB")
+    duration = time.perf_counter() - start
+    tracemalloc.stop()
+    print(f"{repeat / duration:.0f} flows/s")
+
+
+BENCHMARKS: dict[str, Callable[[int], Any]] = {
+    "encoded-responses": benchmark_encoded_responses,
+    "etag": benchmark_etag,
+    "compression": benchmark_compression,
+    "bundle": benchmark_bundle,
+    "reactions": benchmark_reactions,
+    "sessions": benchmark_sessions,
+    "auth": benchmark_auth,
+    "auth-flows": benchmark_auth_flows,
+}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--repeat", type=int, default=2000, help="Number of requests sent to every path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    asyncio.run(BENCHMARKS[args.benchmark](args.repeat))
+
+
+if __name__ == "__main__":
+    main()
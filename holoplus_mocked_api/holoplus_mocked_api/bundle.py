@@ -0,0 +1,283 @@
+# ruff: noqa: T201
+"""
+Fixtures bundle: every fixture served by `FixtureStore`, encoded to JSON and compiled into one indexed file.
+
+The file starts with a header and an index of `(route, key) -> (offset, size, etag)` entries,
+followed by the encoded (and optionally precompressed) bodies. The app memory-maps the bundle on startup
+and serves the bodies as slices of the mapping, so no loose JSON files are opened or decoded.
+
+Build with `python -m holoplus_mocked_api.bundle`, or let the app build shared bundle on startup,
+see `Bundle.open_shared()`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import collections
+import hashlib
+import logging
+import mmap
+import os
+import pathlib
+import struct
+import tempfile
+import time
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+import litestar.serialization
+import msgspec
+
+from .compression import precompress
+from .responses import compute_etag
+
+if TYPE_CHECKING:
+    from .fixtures import FixtureRoute
+
+_logger = logging.getLogger(__name__)
+
+# Served instead of the loose `data/` files when it exists and was built from the current files,
+# build it with `python -m holoplus_mocked_api.bundle`
+BUNDLE_PATH = pathlib.Path(
+    os.getenv("HOLOPLUS_BUNDLE", default=str(pathlib.Path(__file__).parent / "fixtures.bundle")),
+)
+
+# Build the bundle into shared memory on startup, so that all workers map the same pages instead of loading
+# their own copies of the fixtures
+SHARED_BUNDLE = os.getenv("HOLOPLUS_SHARED_BUNDLE", default="0") == "1"
+
+# Where the shared bundle is built, `/dev/shm` is memory-backed on Linux
+_SHM_PATH = pathlib.Path("/dev/shm")  # noqa: S108
+SHARED_BUNDLE_PATH = pathlib.Path(
+    os.getenv("HOLOPLUS_SHARED_BUNDLE_PATH", default="")
+    or (_SHM_PATH if _SHM_PATH.is_dir() else pathlib.Path(tempfile.gettempdir())) / "holoplus-mocked-api.bundle"
+)
+
+MAGIC = b"HOLOPLUS-BUNDLE2"
+# magic, index size
+HEADER = struct.Struct("<16sQ")
+
+
+class BundleEntry(msgspec.Struct, array_like=True, frozen=True):
+    route: str
+    key: str | None
+    """Fixture key converted to string, `FixtureRoute.key` converts it back"""
+    offset: int
+    """Offset of the body from the end of the index"""
+    size: int
+    etag: str
+    compressed: dict[str, tuple[int, int]] = {}
+    """Offsets and sizes of precompressed bodies by content encoding"""
+
+
+class BundleIndex(msgspec.Struct, array_like=True, frozen=True):
+    entries: list[BundleEntry]
+    compression_encodings: tuple[str, ...] = ()
+    """Encodings the large bodies are precompressed with"""
+    fingerprint: str = ""
+    """Fingerprint of the data files the bundle was built from, see `fingerprint()`"""
+
+
+class BundleError(Exception):
+    pass
+
+
+class Bundle:
+    """
+    Memory-mapped fixtures bundle.
+    Bodies are returned as `memoryview` slices of the mapping, and are sent as they are, without copying.
+
+    Only the bodies are shared between processes that map the same bundle. Paginators and id indexes
+    of paginated and indexed fixtures (see `FixtureStore`) are decoded from the bodies by every process
+    on startup, so their memory is per worker.
+    """
+
+    def __init__(self, path: pathlib.Path, buffer: mmap.mmap, index: BundleIndex, data_offset: int) -> None:
+        self.path = path
+        self.compression_encodings = index.compression_encodings
+        self.fingerprint = index.fingerprint
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._data_offset = data_offset
+        self._entries: dict[str, list[BundleEntry]] = collections.defaultdict(list)
+        for entry in index.entries:
+            self._entries[entry.route].append(entry)
+
+    def __contains__(self, route: str) -> bool:
+        return route in self._entries
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    @classmethod
+    def open(cls, path: pathlib.Path) -> Bundle | None:
+        """
+        Returns `None` when the bundle does not exist, or when it's invalid or built by incompatible version
+        (with a warning), so that the loose files are used instead
+        """
+        try:
+            with path.open("rb") as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            return None
+        except ValueError:  # empty file can't be mapped
+            _logger.warning("Ignoring invalid fixtures bundle %s, rebuild it", path)
+            return None
+
+        if len(buffer) < HEADER.size or HEADER.unpack_from(buffer)[0] != MAGIC:
+            _logger.warning("Ignoring fixtures bundle %s built by incompatible version, rebuild it", path)
+            buffer.close()
+            return None
+
+        _, index_size = HEADER.unpack_from(buffer)
+        try:
+            index = msgspec.msgpack.decode(buffer[HEADER.size : HEADER.size + index_size], type=BundleIndex)
+        except msgspec.DecodeError:
+            _logger.warning("Ignoring invalid fixtures bundle %s, rebuild it", path)
+            buffer.close()
+            return None
+        return cls(path, buffer, index, data_offset=HEADER.size + index_size)
+
+    @classmethod
+    def open_shared(
+        cls,
+        routes: Iterable[FixtureRoute],
+        path: pathlib.Path = SHARED_BUNDLE_PATH,
+        *,
+        compression_encodings: tuple[str, ...] = (),
+    ) -> Bundle:
+        """
+        Opens bundle in shared memory, building it first when it doesn't exist or its data files changed.
+
+        Every worker process calls this on startup. The first one builds the bundle under exclusive file lock,
+        the others wait for the lock and then only map the finished file. All workers then share the same
+        physical pages, so memory usage doesn't grow with the number of workers.
+        """
+        import fcntl  # POSIX only
+
+        routes = list(routes)
+        current = fingerprint(routes, compression_encodings)
+
+        with (path.parent / f"{path.name}.lock").open("wb") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                bundle = cls.open(path)
+                if bundle is not None and bundle.fingerprint == current:
+                    return bundle
+
+                start = time.perf_counter()
+                count = build_bundle(routes, path, compression_encodings=compression_encodings, fingerprint=current)
+                _logger.info("Built shared bundle of %s fixtures in %.3fs", count, time.perf_counter() - start)
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+
+        bundle = cls.open(path)
+        if bundle is None:
+            raise BundleError(f"Shared fixtures bundle was removed: {path}")
+        return bundle
+
+    def _slice(self, offset: int, size: int) -> memoryview:
+        start = self._data_offset + offset
+        return self._view[start : start + size]
+
+    def iter_route(self, route: str) -> Iterator[tuple[str | None, memoryview, str, dict[str, memoryview]]]:
+        """Yields key, body, ETag and precompressed bodies of every fixture of the route"""
+        for entry in self._entries.get(route, []):
+            compressed = {encoding: self._slice(*location) for encoding, location in entry.compressed.items()}
+            yield entry.key, self._slice(entry.offset, entry.size), entry.etag, compressed
+
+
+def fingerprint(routes: Iterable[FixtureRoute], compression_encodings: tuple[str, ...] = ()) -> str:
+    """
+    Fingerprint of names, sizes and modification times of the data files of all routes.
+    Only the files are stat-ed, so it's cheap enough to be checked by every worker on startup.
+    Routes without data files (values built in code) are fingerprinted by their encoded values, they are small.
+    """
+    digest = hashlib.blake2b(MAGIC + repr(compression_encodings).encode(), digest_size=16)
+    for route in routes:
+        digest.update(route.name.encode())
+        if route.path is None:
+            for key, value in route.load():
+                digest.update(f"{key!r}:".encode())
+                digest.update(litestar.serialization.encode_json(value))
+        for _, path in route.iter_paths():
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def build_bundle(
+    routes: Iterable[FixtureRoute],
+    path: pathlib.Path,
+    *,
+    compression_encodings: tuple[str, ...] = (),
+    fingerprint: str = "",
+) -> int:
+    """Encodes (and precompresses) fixtures of all routes into bundle at the path, returns number of the fixtures"""
+    entries: list[BundleEntry] = []
+    bodies: list[bytes] = []
+    offset = 0
+
+    for route in routes:
+        for key, value in route.load():
+            body = litestar.serialization.encode_json(value)
+            bodies.append(body)
+            body_offset, offset = offset, offset + len(body)
+
+            compressed: dict[str, tuple[int, int]] = {}
+            for encoding, compressed_body in precompress(body, compression_encodings).items():
+                bodies.append(compressed_body)
+                compressed[encoding] = (offset, len(compressed_body))
+                offset += len(compressed_body)
+
+            entries.append(
+                BundleEntry(
+                    route=route.name,
+                    key=None if key is None else str(key),
+                    offset=body_offset,
+                    size=len(body),
+                    etag=compute_etag(body),
+                    compressed=compressed,
+                )
+            )
+
+    index = msgspec.msgpack.encode(
+        BundleIndex(entries=entries, compression_encodings=compression_encodings, fingerprint=fingerprint)
+    )
+
+    # written to temporary file first, so that running app never maps half-written bundle
+    tmp_path = path.with_name(f"{path.name}.tmp")
+    with tmp_path.open("wb") as f:
+        f.write(HEADER.pack(MAGIC, len(index)))
+        f.write(index)
+        f.writelines(bodies)
+    tmp_path.replace(path)
+
+    return len(entries)
+
+
+def main() -> None:
+    from .app import COMPRESSION, FIXTURE_ROUTES
+    from .compression import compression_encodings
+
+    parser = argparse.ArgumentParser(description="Compiles fixtures from all `data/` directories into one bundle")
+    parser.add_argument("--output", type=pathlib.Path, default=BUNDLE_PATH, help=f"Default: {BUNDLE_PATH}")
+    parser.add_argument(
+        "--compression",
+        choices=["gzip", "brotli"],
+        default=COMPRESSION,
+        help="Also store bodies precompressed for this backend. Default: HOLOPLUS_COMPRESSION",
+    )
+    args = parser.parse_args()
+
+    encodings = compression_encodings(args.compression)
+    count = build_bundle(
+        FIXTURE_ROUTES,
+        args.output,
+        compression_encodings=encodings,
+        fingerprint=fingerprint(FIXTURE_ROUTES, encodings),
+    )
+    print(f"Bundled {count} fixtures into {args.output} ({args.output.stat().st_size} bytes)")
+
+
+if __name__ == "__main__":
+    main()
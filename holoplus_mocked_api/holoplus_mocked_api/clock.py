@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Annotated
+
+import msgspec
+from litestar.datastructures import State
+
+# Virtual time on startup, unix timestamp or `now`; default is the time the stream events were captured
+CLOCK_START = os.getenv("HOLOPLUS_CLOCK_START", default="") or None
+
+# How many virtual seconds pass in one real second
+CLOCK_SPEED = float(os.getenv("HOLOPLUS_CLOCK_SPEED", default="1"))
+
+# Virtual time stands still until resumed with `PUT /_admin/clock` (see `HOLOPLUS_ADMIN`)
+CLOCK_PAUSED = os.getenv("HOLOPLUS_CLOCK_PAUSED", default="0") == "1"
+
+
+class ClockState(msgspec.Struct, kw_only=True):
+    time: Annotated[float, msgspec.Meta(examples=[1757169645.0])] = msgspec.field()
+    """Current virtual time"""
+    offset: Annotated[float, msgspec.Meta(examples=[-3600.0])] = msgspec.field()
+    """Current virtual time minus current real time"""
+    speed: Annotated[float, msgspec.Meta(gt=0, examples=[60.0])] = msgspec.field()
+    paused: Annotated[bool, msgspec.Meta(examples=[False])] = msgspec.field()
+
+
+class VirtualClock:
+    """
+    Server-wide time used by everything time-dependent (stream event plans, `created_at` of created content,
+    `updated_at` of channels, token expiration), so that the mocked world can be moved in time.
+
+    Virtual time is kept as an anchor (virtual time at a monotonic instant) that moves `speed` times faster
+    than real time. Every change re-anchors at the current virtual time, so the time never jumps
+    unless it is set explicitly.
+    """
+
+    def __init__(self, *, start: float | None = None, speed: float = 1.0, paused: bool = False) -> None:
+        if speed <= 0:
+            raise ValueError(f"Clock speed must be positive: {speed}")
+        self._anchor_time = time.time() if start is None else start
+        self._anchor_monotonic = time.monotonic()
+        self.speed = speed
+        self.paused = paused
+
+    def time(self) -> float:
+        if self.paused:
+            return self._anchor_time
+        return self._anchor_time + (time.monotonic() - self._anchor_monotonic) * self.speed
+
+    def real_duration(self, seconds: float) -> float:
+        """Real seconds in which `seconds` of virtual time pass; paused clock is treated as running at its speed"""
+        return seconds / self.speed
+
+    def set(
+        self,
+        *,
+        at: float | None = None,
+        offset: float | None = None,
+        speed: float | None = None,
+        paused: bool | None = None,
+    ) -> None:
+        """Sets virtual time (absolute `at`, or as offset from real time), speed and pause, unset values are kept"""
+        if speed is not None and speed <= 0:
+            raise ValueError(f"Clock speed must be positive: {speed}")
+
+        anchor_time = self.time()
+        if offset is not None:
+            anchor_time = time.time() + offset
+        if at is not None:
+            anchor_time = at
+
+        self._anchor_time = anchor_time
+        self._anchor_monotonic = time.monotonic()
+        self.speed = self.speed if speed is None else speed
+        self.paused = self.paused if paused is None else paused
+
+    def state(self) -> ClockState:
+        now = self.time()
+        return ClockState(time=now, offset=now - time.time(), speed=self.speed, paused=self.paused)
+
+
+def provide_clock(state: State) -> VirtualClock:
+    return state.clock
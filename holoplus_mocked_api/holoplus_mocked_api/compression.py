@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import functools
+import gzip
+import importlib.util
+import logging
+from typing import Any, Literal, Mapping, cast
+
+import litestar.middleware.compression
+from litestar.datastructures import MutableScopeHeaders
+from litestar.enums import CompressionEncoding
+from litestar.types import Message, Scope, Send
+
+_logger = logging.getLogger(__name__)
+
+CompressionBackend = Literal["gzip", "brotli"]
+
+# Same as default `CompressionConfig.minimum_size`, smaller bodies are not worth compressing
+MINIMUM_SIZE = 500
+
+# Key of scope state with the encoding `CompressionMiddleware` compresses the response with on the fly
+COMPRESSION_ENCODING_STATE_KEY = "holoplus_compression_encoding"
+
+
+@functools.cache
+def brotli_available() -> bool:
+    """`brotli` is optional dependency, installed with `litestar[brotli]`"""
+    return importlib.util.find_spec("brotli") is not None
+
+
+def available_backend(backend: CompressionBackend | None) -> CompressionBackend | None:
+    """Returns `gzip` (with a warning) instead of `brotli` when `brotli` is not installed"""
+    if backend == "brotli" and not brotli_available():
+        _logger.warning("brotli is not installed (pip install litestar[brotli]), falling back to gzip")
+        return "gzip"
+    return backend
+
+
+def compression_encodings(backend: CompressionBackend | None) -> tuple[str, ...]:
+    """Content encodings that should be precompressed for given compression backend, `br` only if it's installed"""
+    if backend == "brotli" and brotli_available():
+        return ("br", "gzip")
+    if backend in ("brotli", "gzip"):
+        return ("gzip",)
+    return ()
+
+
+def compress(body: bytes | memoryview, encoding: str) -> bytes:
+    if encoding == "gzip":
+        # `mtime=0` makes the output deterministic
+        return gzip.compress(body, compresslevel=9, mtime=0)
+    if encoding == "br":
+        # optional dependency, installed with `litestar[brotli]`
+        import brotli  # type: ignore[import-not-found, import-untyped, unused-ignore]
+
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=11)
+    raise ValueError(f"Unsupported encoding: {encoding}")
+
+
+def precompress(body: bytes | memoryview, encodings: tuple[str, ...]) -> dict[str, bytes]:
+    if len(body) < MINIMUM_SIZE:
+        return {}
+    return {encoding: compress(body, encoding) for encoding in encodings}
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """ETag of compressed variant, every variant needs its own strong ETag"""
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def on_the_fly_encoding(scope: Scope) -> str | None:
+    """Encoding the response will be compressed with by `CompressionMiddleware` (if it's big enough)"""
+    return cast("dict[str, Any]", scope.get("state", {})).get(COMPRESSION_ENCODING_STATE_KEY)
+
+
+def select_encoding(accept_encoding: str | None, available: Mapping[str, object]) -> str | None:
+    """
+    Selects available encoding with the highest `q` value accepted by the client,
+    encodings with the same `q` in the order of `available`. `*` matches encodings not listed explicitly,
+    and encodings with `q=0` (or invalid `q`) are not accepted.
+    """
+    if not accept_encoding or not available:
+        return None
+
+    weights: dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, *params = part.split(";")
+        weight = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        weights[name.strip().lower()] = weight
+
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+class CompressionMiddleware(litestar.middleware.compression.CompressionMiddleware):
+    """
+    Compression middleware that leaves already compressed responses (precompressed fixtures) alone,
+    instead of compressing them again.
+
+    Responses it compresses get the encoding suffix in their ETag, same as precompressed fixtures,
+    so that identity and compressed variants don't share the same strong ETag.
+    """
+
+    def create_compression_send_wrapper(self, send: Send, compression_encoding: str, scope: Scope) -> Send:
+        if isinstance(compression_encoding, CompressionEncoding):
+            compression_encoding = compression_encoding.value
+        cast("dict[str, Any]", scope.setdefault("state", {}))[COMPRESSION_ENCODING_STATE_KEY] = compression_encoding
+
+        async def etag_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableScopeHeaders(message)
+                if headers.get("content-encoding") == compression_encoding and (etag := headers.get("etag")):
+                    headers["etag"] = encoded_etag(etag, compression_encoding)
+            await send(message)
+
+        compression_send = super().create_compression_send_wrapper(
+            send=etag_send,
+            compression_encoding=compression_encoding,
+            scope=scope,
+        )
+        is_compressed = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal is_compressed
+
+            if message["type"] == "http.response.start":
+                is_compressed = "content-encoding" in MutableScopeHeaders(message)
+
+            if is_compressed:
+                await send(message)
+            else:
+                await compression_send(message)
+
+        return send_wrapper
@@ -67,6 +67,13 @@ class HoloplusMissingTokenException(HoloplusException):
     holoplus_detail = "authorization header is missing"
 
 
+class HoloplusInvalidTokenException(HoloplusException):
+    status_code = status_codes.HTTP_401_UNAUTHORIZED  # TODO: verify
+    holoplus_code = "Unauthorized"
+    holoplus_message = "Authentication failed😢\nPlease check your internet connection and try again!"
+    holoplus_detail = "authorization token is invalid or expired"
+
+
 class ErrorResponse(msgspec.Struct, kw_only=True):
     code: Annotated[str, msgspec.Meta(examples=["Bad Request"])] = msgspec.field()
     message: Annotated[
@@ -0,0 +1,322 @@
+from __future__ import annotations
+
+import functools
+import logging
+import pathlib
+import time
+import uuid
+from typing import TYPE_CHECKING, Any, Callable, Collection, Hashable, Iterable, Iterator, Mapping, Self, cast
+
+import litestar
+import litestar.serialization
+import msgspec
+from litestar.datastructures import State
+
+from .compression import precompress
+from .lazy import CacheInfo, LazyMap
+from .pagination import Paginator
+from .responses import FixtureResponse, compute_etag
+
+if TYPE_CHECKING:
+    from .bundle import Bundle
+
+_logger = logging.getLogger(__name__)
+
+
+class FixtureRoute(msgspec.Struct, kw_only=True, frozen=True):
+    """
+    Fixtures that are served by one route.
+
+    - If `values` are set, they are used as they are (data already loaded by `data/__init__.py`),
+      `LazyMap` values are not loaded until requested
+    - If `path` is a file, it's loaded as single fixture with `None` key
+    - If `path` is a directory, every `{prefix}{key}.json` file in it is loaded
+
+    `path` of routes with `values` is used only to find the fixtures that have to be reloaded when files change.
+    """
+
+    name: str
+    path: pathlib.Path | None = None
+    model: type[msgspec.Struct] | None = None
+    prefix: str = ""
+    key: Callable[[str], Hashable] = str
+    """Converts file name (without prefix), or key stored in bundle, to fixture key"""
+    values: Mapping[Any, msgspec.Struct] | None = None
+    paginated: bool = False
+    """Fixtures have `items` that can be requested by pages, see `FixtureStore.paginator()`"""
+    newest_first: bool = False
+    """Items of paginated fixture are newest first, so pages are found by `created_at`, otherwise their order is kept"""
+    languages: Callable[[Any], Collection[str]] | None = None
+    """Returns languages of item of paginated fixture, see `Paginator.filter()`"""
+    talents: Callable[[Any], Iterable[uuid.UUID]] | None = None
+    """Returns talent ids of item of paginated fixture, see `TalentIndex`"""
+    indexed: bool = False
+    """Fixtures have `items` that can be looked up by id, see `FixtureStore.index()`. Paginated routes always are."""
+    depends_on: tuple[str, ...] = ()
+    """Routes that `languages` and `talents` read, paginators are rebuilt when fixtures of these routes change"""
+
+    def iter_paths(self) -> Iterator[tuple[Hashable, pathlib.Path]]:
+        if self.path is None:
+            return
+
+        if self.path.is_file():
+            yield None, self.path
+            return
+
+        for path in sorted(self.path.glob(f"{self.prefix}*.json")):
+            yield self.path_key(path), path
+
+    def match(self, path: pathlib.Path) -> bool:
+        """Checks if the file (that doesn't have to exist anymore) is fixture of this route"""
+        if self.path is None:
+            return False
+        if path == self.path:
+            return True
+        return path.parent == self.path and path.name.startswith(self.prefix) and path.suffix == ".json"
+
+    def path_key(self, path: pathlib.Path) -> Hashable:
+        if path == self.path:
+            return None
+        return self.key(path.stem.removeprefix(self.prefix))
+
+    def load_path(self, path: pathlib.Path) -> msgspec.Struct:
+        return self.decode(path.read_bytes())
+
+    def decode(self, body: bytes | memoryview) -> msgspec.Struct:
+        return litestar.serialization.decode_json(body, self.model, strict=True)
+
+    def load(self) -> Iterator[tuple[Hashable, msgspec.Struct]]:
+        if self.values is not None:
+            yield from self.values.items()
+            return
+
+        for key, path in self.iter_paths():
+            yield key, self.load_path(path)
+
+
+class Fixture(msgspec.Struct, kw_only=True, frozen=True):
+    value: msgspec.Struct | None
+    """Decoded fixture. Not set for fixtures loaded from bundle."""
+    etag: str
+    body: bytes | memoryview | None = None
+    """Value encoded to JSON. Set only when the store is loaded with `encoded=True`, or from bundle."""
+    compressed: dict[str, bytes | memoryview] = msgspec.field(default_factory=dict)
+    """Encoded value compressed with content encodings the store was loaded with, slices of bundle if it has them."""
+
+    @classmethod
+    def from_value(
+        cls, value: msgspec.Struct, *, encoded: bool = False, compression_encodings: tuple[str, ...] = ()
+    ) -> Self:
+        body = litestar.serialization.encode_json(value)
+        return cls(
+            value=value,
+            etag=compute_etag(body),
+            body=body if encoded else None,
+            compressed=precompress(body, compression_encodings),
+        )
+
+    def response(self) -> FixtureResponse:
+        """Response with either the struct itself, or already encoded JSON as content"""
+        return FixtureResponse(
+            content=self.value if self.body is None else self.body,
+            etag=self.etag,
+            compressed=self.compressed,
+            media_type=litestar.MediaType.JSON,
+        )
+
+
+class FixtureStore:
+    """
+    Fixtures indexed by route name and key.
+    Built once on app creation, so that handlers only do a dict lookup instead of reading and decoding files.
+
+    Every fixture gets its ETag on load, so that requests with matching `If-None-Match` are answered
+    with `304 Not Modified` without encoding the fixture.
+    With `encoded=True` the encoded JSON is also kept, and `response()` returns the raw bytes
+    instead of letting Litestar encode the same immutable struct again on every request.
+    With `compression_encodings` the large fixtures are also compressed on load, and clients that accept
+    the encoding get the precompressed body without any compression work done on request.
+
+    Routes with `LazyMap` values are not loaded, fixtures are created on first request
+    and kept in LRU cache of the same size as the values cache.
+
+    Items of paginated routes are also sorted on load, so that pages can be returned without sorting on request,
+    and items of paginated and indexed routes are indexed by id.
+    """
+
+    def __init__(self, *, encoded: bool = False, compression_encodings: tuple[str, ...] = ()) -> None:
+        self._fixtures: dict[tuple[str, Hashable], Fixture] = {}
+        self._lazy_fixtures: dict[str, LazyMap[Any, Fixture]] = {}
+        self._routes: dict[str, FixtureRoute] = {}
+        self._paginators: dict[tuple[str, Hashable], Paginator[Any]] = {}
+        self._indexes: dict[tuple[str, Hashable], dict[uuid.UUID, Any]] = {}
+        self.encoded = encoded
+        self.compression_encodings = compression_encodings
+        self.load_time: float = 0.0
+
+    def __len__(self) -> int:
+        return len(self._fixtures)
+
+    @classmethod
+    def load(
+        cls,
+        routes: Iterable[FixtureRoute],
+        *,
+        encoded: bool = False,
+        compression_encodings: tuple[str, ...] = (),
+        bundle: Bundle | None = None,
+    ) -> Self:
+        """
+        Loads fixtures of all routes.
+        Routes that are in the `bundle` are loaded from it, without reading or decoding their loose files.
+        """
+        store = cls(encoded=encoded, compression_encodings=compression_encodings)
+
+        start = time.perf_counter()
+        for route in routes:
+            store._routes[route.name] = route
+
+            if bundle is not None and route.name in bundle:
+                # bodies precompressed in the bundle are used as they are, instead of compressing them again
+                bundle_compressed = set(compression_encodings) <= set(bundle.compression_encodings)
+                for bundle_key, body, etag, compressed in bundle.iter_route(route.name):
+                    key = None if bundle_key is None else route.key(bundle_key)
+                    store._set_fixture(
+                        route.name,
+                        key,
+                        Fixture(
+                            value=None,
+                            etag=etag,
+                            body=body,
+                            compressed=(
+                                {
+                                    encoding: compressed[encoding]
+                                    for encoding in compression_encodings
+                                    if encoding in compressed
+                                }
+                                if bundle_compressed
+                                else precompress(body, compression_encodings)
+                            ),
+                        ),
+                    )
+                continue
+
+            if isinstance(route.values, LazyMap):
+                store._lazy_fixtures[route.name] = route.values.map(
+                    functools.partial(Fixture.from_value, encoded=encoded, compression_encodings=compression_encodings)
+                )
+                continue
+
+            for key, value in route.load():
+                store._set_fixture(
+                    route.name,
+                    key,
+                    Fixture.from_value(value, encoded=encoded, compression_encodings=compression_encodings),
+                )
+        store.load_time = time.perf_counter() - start
+
+        return store
+
+    @property
+    def lazy_count(self) -> int:
+        """Number of fixtures that are indexed, but not loaded until requested"""
+        return sum(len(fixtures) for fixtures in self._lazy_fixtures.values())
+
+    def is_lazy(self, name: str) -> bool:
+        return name in self._lazy_fixtures
+
+    def cache_info(self) -> dict[str, CacheInfo]:
+        """Hit/miss/eviction counters of lazily loaded routes"""
+        return {name: fixtures.cache_info() for name, fixtures in self._lazy_fixtures.items()}
+
+    def update(self, changes: Mapping[tuple[str, Hashable], Fixture | None]) -> None:
+        """
+        Replaces fixtures, or removes them when the new fixture is `None`.
+        Fixtures of lazily loaded routes are only dropped from cache, and loaded again on next request.
+        Paginators of routes that depend on the changed routes (see `FixtureRoute.depends_on`) are rebuilt.
+
+        All changes are applied at once without yielding to the event loop, so requests never see
+        only some of them.
+        """
+        for (name, key), fixture in changes.items():
+            if (lazy_fixtures := self._lazy_fixtures.get(name)) is not None:
+                lazy_fixtures.discard(key)
+            elif fixture is None:
+                self._fixtures.pop((name, key), None)
+                self._paginators.pop((name, key), None)
+                self._indexes.pop((name, key), None)
+            else:
+                self._set_fixture(name, key, fixture)
+
+        changed = {name for name, _ in changes}
+        for route in self._routes.values():
+            if route.paginated and changed.intersection(route.depends_on):
+                for (name, key), fixture in list(self._fixtures.items()):
+                    if name == route.name and (name, key) not in changes:
+                        self._set_fixture(name, key, fixture)
+
+    def _set_fixture(self, name: str, key: Hashable, fixture: Fixture) -> None:
+        self._fixtures[(name, key)] = fixture
+
+        route = self._routes[name]
+        if route.paginated or route.indexed:
+            value = self._get_value(name, fixture)
+            items = getattr(value, "items")
+            self._indexes[(name, key)] = {item.id: item for item in items}
+            if route.paginated:
+                self._paginators[(name, key)] = Paginator(
+                    items,
+                    newest_first=route.newest_first,
+                    truncated=bool(getattr(value, "next_cursor", None) or getattr(value, "has_next_items", False)),
+                    languages=route.languages,
+                    talents=route.talents,
+                )
+
+    def _get_fixture(self, name: str, key: Hashable) -> Fixture | None:
+        if (lazy_fixtures := self._lazy_fixtures.get(name)) is not None:
+            return lazy_fixtures.get(key)
+        return self._fixtures.get((name, key))
+
+    def _get_value(self, name: str, fixture: Fixture) -> msgspec.Struct:
+        if fixture.value is not None:
+            return fixture.value
+        return self._routes[name].decode(cast("bytes", fixture.body))
+
+    def get(self, name: str, key: Hashable = None) -> Any:
+        """Returns fixture value, fixtures from bundle are decoded on every call"""
+        if fixture := self._get_fixture(name, key):
+            return self._get_value(name, fixture)
+        return None
+
+    def values(self, name: str) -> Iterator[tuple[Hashable, Any]]:
+        """Yields keys and values of all fixtures of the route, fixtures of lazily loaded routes are loaded"""
+        if (lazy_fixtures := self._lazy_fixtures.get(name)) is not None:
+            for key, fixture in lazy_fixtures.items():
+                yield key, self._get_value(name, fixture)
+            return
+
+        for (route_name, key), fixture in self._fixtures.items():
+            if route_name == name:
+                yield key, self._get_value(name, fixture)
+
+    def paginator(self, name: str, key: Hashable = None) -> Paginator[Any] | None:
+        """Sorted items of paginated fixture"""
+        return self._paginators.get((name, key))
+
+    def index(self, name: str, key: Hashable = None) -> Mapping[uuid.UUID, Any] | None:
+        """Items of paginated or indexed fixture by id"""
+        return self._indexes.get((name, key))
+
+    def response(self, name: str, key: Hashable = None) -> Any:
+        """
+        Returns fixture as response that should be returned from handler,
+        with either the struct itself, or already encoded JSON as content.
+        """
+        fixture = self._get_fixture(name, key)
+        if fixture is None:
+            return None
+        return fixture.response()
+
+
+def provide_fixture_store(state: State) -> FixtureStore:
+    return state.fixture_store
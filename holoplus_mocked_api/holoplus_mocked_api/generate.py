@@ -0,0 +1,542 @@
+# ruff: noqa: T201
+"""
+Generator of large synthetic datasets for load testing.
+
+Generates groups, units, talents, v5 threads, talent-channel comments of the threads and stream events,
+using the same models as the mock. All references are consistent (e.g. talents of threads and stream events
+exist in units, comments belong to existing threads and their channels).
+Every generated channel also gets the threads listings (`/v4/threads/updated`, `/v4/talent-channel/threads/newest`
+and `/v4/threads/modules`, with the module id being the channel id) over its generated threads.
+
+Output is deterministic for the same `--seed`, regardless of the number of workers,
+because every chunk of items has its own random generator seeded by the seed and the chunk number.
+
+Files are written in the mock's `data/` layout, so the output can be the package directory itself
+(it has to be given explicitly, so that the captured fixtures are not mixed with generated ones by accident).
+Use `HOLOPLUS_LAZY_FIXTURES=1` when serving millions of items.
+
+Run with `python -m holoplus_mocked_api.generate --help`
+"""
+
+from __future__ import annotations
+
+import argparse
+import concurrent.futures
+import os
+import pathlib
+import random
+import string
+import time
+import uuid
+from typing import Any, get_args
+
+import faker
+import msgspec
+
+from .enums import FilterLanguages
+from .v2.models import Group, GroupUnit, Unit, UnitTalent
+from .v4.stream_events.models import StreamEvent, StreamEventStreamer, StreamEventTalent
+from .v4.talent_channel.models.talent_channel__comments import (
+    TalentChannelCommentsResponse,
+    TalentChannelCommentsResponseItem,
+    TalentChannelCommentsResponseItemChannel,
+    TalentChannelCommentsResponseItemTranslation,
+    TalentChannelCommentsResponseItemUser,
+    TalentChannelCommentsResponseItemUserIcon,
+    TalentChannelCommentsResponseItemUserRole,
+)
+from .v4.talent_channel.models.talent_channel__threads import (
+    TalentChannelThreadsResponseChannel,
+    TalentChannelThreadsResponseItem,
+    TalentChannelThreadsResponseItemTalent,
+    TalentChannelThreadsResponseItemTranslation,
+    TalentChannelThreadsResponseItemUser,
+)
+from .v4.threads.models import (
+    ThreadsModulesResponse,
+    ThreadsModulesResponseItem,
+    ThreadsUpdatedResponse,
+    ThreadsUpdatedResponseItem,
+)
+from .v5.models import (
+    Thread,
+    ThreadChannel,
+    ThreadChannelCommunity,
+    ThreadTalent,
+    ThreadTranslation,
+    ThreadUser,
+    ThreadUserIcon,
+    ThreadUserRole,
+)
+
+# Items are generated in chunks of this size, every chunk has its own seed
+CHUNK_SIZE = 1000
+
+# Timestamps are generated relative to this time, not to current time, so that the output is reproducible
+END_TIME = 1757165660
+YEAR = 365 * 24 * 60 * 60
+
+ROLE_NONE_ID = uuid.UUID("a0a44a43-18bc-4444-96bf-4fb188f3c8d9")
+COMMUNITY_ID = uuid.UUID("f30a0c54-73c0-46c1-b413-9e3af0f672ff")
+COMMUNITY_ICON_URL = "https://asset.holoplus.com/communities/hololive/icon_hololive.png"
+LANGUAGES = list(get_args(FilterLanguages))
+
+
+class Talent(msgspec.Struct, kw_only=True, frozen=True):
+    id: uuid.UUID
+    name: str
+    key_name: str
+    group_id: uuid.UUID
+
+    @property
+    def img_url(self) -> str:
+        return f"https://asset.holoplus.com/talents/generated/{self.key_name}/icon.png"
+
+
+class User(msgspec.Struct, kw_only=True, frozen=True):
+    id: uuid.UUID
+    name: str
+    icon_id: uuid.UUID
+    icon_url: str
+
+
+class ListedThread(msgspec.Struct, kw_only=True, frozen=True):
+    """Generated thread as it appears in the listings, returned from the chunks to the main process"""
+
+    id: uuid.UUID
+    channel_id: uuid.UUID
+    created_at: int
+    updated_at: int
+    talent_channel_item: bytes
+
+
+class Context(msgspec.Struct, kw_only=True, frozen=True):
+    """Data shared by all chunks, generated before the chunks"""
+
+    seed: int
+    output: pathlib.Path
+    talents: list[Talent]
+    users: list[User]
+    channels: list[ThreadChannel]
+    comments_per_thread: int
+
+
+def random_uuid(rng: random.Random) -> uuid.UUID:
+    return uuid.UUID(int=rng.getrandbits(128), version=4)
+
+
+def create_generators(seed: int, *stream: Any) -> tuple[random.Random, faker.Faker]:
+    """Random generator and Faker seeded by the seed and the stream identifiers (e.g. item kind and chunk number)"""
+    rng = random.Random(f"{seed}:{':'.join(map(str, stream))}")  # noqa: S311 - reproducible, not for security
+    fake = faker.Faker()
+    fake.seed_instance(rng.getrandbits(64))
+    return rng, fake
+
+
+def write_json(path: pathlib.Path, value: msgspec.Struct) -> None:
+    path.write_bytes(msgspec.json.encode(value))
+
+
+# shared data
+
+
+def generate_talents(seed: int, count: int, groups: list[Group]) -> list[Talent]:
+    rng, fake = create_generators(seed, "talents")
+    talents = []
+    for i in range(count):
+        name = fake.name()
+        talents.append(
+            Talent(
+                id=random_uuid(rng),
+                name=name,
+                key_name=f"{name.lower().replace(' ', '_').replace('.', '')}_{i}",
+                group_id=groups[i % len(groups)].id,
+            )
+        )
+    return talents
+
+
+def generate_users(seed: int, count: int) -> list[User]:
+    rng, fake = create_generators(seed, "users")
+    return [
+        User(
+            id=random_uuid(rng),
+            name=fake.user_name(),
+            icon_id=random_uuid(rng),
+            icon_url=f"https://asset.holoplus.com/icons/generated/{rng.randrange(100)}.png",
+        )
+        for _ in range(count)
+    ]
+
+
+def generate_channels(seed: int, count: int) -> list[ThreadChannel]:
+    rng, fake = create_generators(seed, "channels")
+    channels = []
+    for i in range(count):
+        created_at = END_TIME - 2 * YEAR + rng.randrange(YEAR)
+        channels.append(
+            ThreadChannel(
+                id=random_uuid(rng),
+                name=f"{fake.word().capitalize()} Chat",
+                guideline=fake.paragraph(),
+                sort=i,
+                created_at=created_at,
+                updated_at=created_at,
+                deleted_at=None,
+                community=ThreadChannelCommunity(id=COMMUNITY_ID, icon_url=COMMUNITY_ICON_URL),
+                channel_type="open",
+                icon_url="",
+            )
+        )
+    return channels
+
+
+def generate_groups_and_units(seed: int, units_count: int) -> tuple[list[Group], list[Unit]]:
+    """Units are created without talents, they are added after talents are generated"""
+    rng, fake = create_generators(seed, "units")
+    units = [Unit(id=random_uuid(rng), name=f"{fake.company()} Unit", talents=[]) for _ in range(units_count)]
+    groups = []
+    for i in range(0, units_count, 6):
+        group_units = units[i : i + 6]
+        groups.append(
+            Group(
+                id=random_uuid(rng),
+                name=fake.company(),
+                units=[GroupUnit(id=unit.id, name=unit.name) for unit in group_units],
+                created_at=0,
+                updated_at=0,
+            )
+        )
+    return groups, units
+
+
+def assign_talents(units: list[Unit], talents: list[Talent]) -> None:
+    for i, talent in enumerate(talents):
+        units[i % len(units)].talents.append(
+            UnitTalent(
+                id=talent.id,
+                name=talent.name,
+                key_name=talent.key_name,
+                img_url=talent.img_url,
+                created_at=None,
+                updated_at=None,
+                deleted_at=None,
+                group_id=talent.group_id,
+            )
+        )
+
+
+# chunks
+
+_context: Context | None = None
+
+
+def _init_worker(context: Context) -> None:
+    global _context  # noqa: PLW0603
+    _context = context
+
+
+def _get_context() -> Context:
+    if _context is None:
+        raise RuntimeError("Worker was not initialized")
+    return _context
+
+
+def generate_threads(chunk: int, count: int) -> tuple[int, list[ListedThread]]:
+    """Generates threads and their talent-channel comments, returns number of generated items and the listed threads"""
+    context = _get_context()
+    rng, fake = create_generators(context.seed, "threads", chunk)
+
+    threads_path = context.output / "v5" / "data" / "threads"
+    comments_path = context.output / "v4" / "talent_channel" / "data" / "talent-channel__comments__newest"
+
+    listed = []
+    for _ in range(count):
+        created_at = END_TIME - rng.randrange(YEAR)
+        user = rng.choice(context.users)
+        channel = rng.choice(context.channels)
+        language = rng.choice(LANGUAGES)
+        title = fake.sentence()
+        body = fake.paragraph()
+        thread = Thread(
+            id=random_uuid(rng),
+            title=title,
+            body=body,
+            channel=channel,
+            images=[],
+            talents=[
+                ThreadTalent(id=talent.id, name=talent.name, key_name=talent.key_name, img_url=talent.img_url)
+                for talent in rng.sample(context.talents, k=min(rng.randrange(3), len(context.talents)))
+            ],
+            user=ThreadUser(
+                id=user.id,
+                name=user.name,
+                icon=ThreadUserIcon(id=user.icon_id, icon_url=user.icon_url),
+                role=ThreadUserRole(id=ROLE_NONE_ID, name="none"),
+            ),
+            created_at=created_at,
+            updated_at=created_at + rng.randrange(3600),
+            original_language=language,
+            is_translated=False,
+            translations={language: ThreadTranslation(title=title, body=body)},
+        )
+        write_json(threads_path / f"{thread.id}.json", thread)
+
+        listed.append(
+            ListedThread(
+                id=thread.id,
+                channel_id=channel.id,
+                created_at=thread.created_at,
+                updated_at=thread.updated_at,
+                talent_channel_item=msgspec.json.encode(
+                    TalentChannelThreadsResponseItem(
+                        id=thread.id,
+                        title=title,
+                        body=body,
+                        talents=[
+                            TalentChannelThreadsResponseItemTalent(
+                                id=talent.id, name=talent.name, img_url=talent.img_url, key_name=talent.key_name
+                            )
+                            for talent in thread.talents
+                        ],
+                        user=TalentChannelThreadsResponseItemUser(
+                            id=user.id, name=user.name, role="none", icon_url=user.icon_url
+                        ),
+                        created_at=thread.created_at,
+                        updated_at=thread.updated_at,
+                        original_language=language,
+                        is_translated=False,
+                        translations={language: TalentChannelThreadsResponseItemTranslation(title=title, body=body)},
+                        reaction_total=0,
+                        reply_count=context.comments_per_thread,
+                        is_favorite=False,
+                        user_reacted_count=0,
+                    )
+                ),
+            )
+        )
+
+        comments = []
+        for _ in range(context.comments_per_thread):
+            comment_user = rng.choice(context.users)
+            comment_body = fake.sentence()
+            comments.append(
+                TalentChannelCommentsResponseItem(
+                    id=random_uuid(rng),
+                    parent_id="",
+                    body=comment_body,
+                    user=TalentChannelCommentsResponseItemUser(
+                        id=comment_user.id,
+                        name=comment_user.name,
+                        role=TalentChannelCommentsResponseItemUserRole(id=ROLE_NONE_ID, role="none"),
+                        icon=TalentChannelCommentsResponseItemUserIcon(
+                            id=comment_user.icon_id, icon_url=comment_user.icon_url
+                        ),
+                    ),
+                    channel=TalentChannelCommentsResponseItemChannel(
+                        id=channel.id, name=channel.name, channel_type=channel.channel_type
+                    ),
+                    created_at=created_at + rng.randrange(7 * 24 * 3600),
+                    original_language=language,
+                    is_translated=False,
+                    translations={language: TalentChannelCommentsResponseItemTranslation(body=comment_body)},
+                    reaction_total=rng.randrange(100),
+                    reply_count=0,
+                    user_reacted_count=0,
+                )
+            )
+        comments.sort(key=lambda x: x.created_at, reverse=True)
+        write_json(comments_path / f"{thread.id}.json", TalentChannelCommentsResponse(items=comments))
+
+    return count * (1 + context.comments_per_thread), listed
+
+
+def generate_stream_events(chunk: int, count: int) -> int:
+    context = _get_context()
+    rng, fake = create_generators(context.seed, "stream_events", chunk)
+
+    stream_events_path = context.output / "v4" / "stream_events" / "data" / "stream_events"
+
+    for _ in range(count):
+        video_id = "".join(rng.choices(string.ascii_letters + string.digits + "-_", k=11))
+        talents = rng.sample(context.talents, k=min(1 + rng.randrange(3), len(context.talents)))
+        date_time = END_TIME + rng.randrange(-30 * 24 * 3600, 30 * 24 * 3600)
+        stream_event = StreamEvent(
+            id=video_id,
+            date_time=date_time,
+            is_live=False,
+            platform_type="youtube",
+            url=f"https://www.youtube.com/watch?v={video_id}",
+            thumbnail=f"https://img.youtube.com/vi/{video_id}/mqdefault.jpg",
+            title=fake.sentence(),
+            reaction_total=rng.randrange(1000),
+            streamer=StreamEventStreamer(
+                id="", name=talents[0].name, image_url=talents[0].img_url, created_at=None, updated_at=None
+            ),
+            talents=[
+                StreamEventTalent(
+                    id=talent.id,
+                    name=talent.name,
+                    key_name=talent.key_name,
+                    img_url=talent.img_url,
+                    created_at=0,
+                    updated_at=0,
+                    deleted_at=None,
+                    group_id=talent.group_id,
+                )
+                for talent in talents
+            ],
+            created_at=date_time - 7 * 24 * 3600,
+            updated_at=date_time - 7 * 24 * 3600,
+        )
+        write_json(stream_events_path / f"{stream_event.id}.json", stream_event)
+
+    return count
+
+
+def iter_chunks(count: int) -> list[tuple[int, int]]:
+    return [(chunk, min(CHUNK_SIZE, count - start)) for chunk, start in enumerate(range(0, count, CHUNK_SIZE))]
+
+
+def write_listings(output: pathlib.Path, channels: list[ThreadChannel], listed: list[ListedThread]) -> int:
+    """Writes threads listings of every channel (module listing keyed by channel id), returns number of listings"""
+    threads_path = output / "v4" / "threads" / "data"
+    talent_channel_path = output / "v4" / "talent_channel" / "data" / "talent-channel__threads__newest"
+
+    by_channel: dict[uuid.UUID, list[ListedThread]] = {channel.id: [] for channel in channels}
+    for thread in listed:
+        by_channel[thread.channel_id].append(thread)
+
+    for channel in channels:
+        threads = sorted(by_channel[channel.id], key=lambda x: (x.created_at, x.id), reverse=True)
+        write_json(
+            threads_path / "threads__modules" / f"{channel.id}.json",
+            ThreadsModulesResponse(
+                items=[ThreadsModulesResponseItem(id=thread.id, created_at=thread.created_at) for thread in threads],
+                next_cursor="",
+            ),
+        )
+        write_json(
+            threads_path / "threads__updated" / f"{channel.id}.json",
+            ThreadsUpdatedResponse(
+                items=[
+                    ThreadsUpdatedResponseItem(id=thread.id, created_at=thread.created_at)
+                    for thread in sorted(threads, key=lambda x: (x.updated_at, x.id), reverse=True)
+                ],
+                has_next_items=False,
+            ),
+        )
+        # items are already encoded, the response is assembled from them instead of decoding them again
+        talent_channel = TalentChannelThreadsResponseChannel(
+            id=channel.id, name=channel.name, channel_type=channel.channel_type, icon_url=channel.icon_url
+        )
+        (talent_channel_path / f"{channel.id}.json").write_bytes(
+            b'{"items":['
+            + b",".join(thread.talent_channel_item for thread in threads)
+            + b'],"channel":'
+            + msgspec.json.encode(talent_channel)
+            + b"}"
+        )
+
+    return 3 * len(channels)
+
+
+def generate(
+    output: pathlib.Path,
+    *,
+    seed: int,
+    threads: int,
+    comments_per_thread: int,
+    stream_events: int,
+    units: int,
+    talents: int,
+    users: int,
+    channels: int,
+    workers: int | None = None,
+) -> int:
+    """Generates the dataset, returns number of generated items"""
+    for path in [
+        output / "v2" / "data" / "groups",
+        output / "v2" / "data" / "units",
+        output / "v5" / "data" / "threads",
+        output / "v4" / "talent_channel" / "data" / "talent-channel__comments__newest",
+        output / "v4" / "talent_channel" / "data" / "talent-channel__threads__newest",
+        output / "v4" / "threads" / "data" / "threads__modules",
+        output / "v4" / "threads" / "data" / "threads__updated",
+        output / "v4" / "stream_events" / "data" / "stream_events",
+    ]:
+        path.mkdir(parents=True, exist_ok=True)
+
+    groups_list, units_list = generate_groups_and_units(seed, units)
+    talents_list = generate_talents(seed, talents, groups_list)
+    assign_talents(units_list, talents_list)
+    for group in groups_list:
+        write_json(output / "v2" / "data" / "groups" / f"{group.id}.json", group)
+    for unit in units_list:
+        write_json(output / "v2" / "data" / "units" / f"{unit.id}.json", unit)
+
+    context = Context(
+        seed=seed,
+        output=output,
+        talents=talents_list,
+        users=generate_users(seed, users),
+        channels=generate_channels(seed, channels),
+        comments_per_thread=comments_per_thread,
+    )
+
+    total = len(groups_list) + len(units_list)
+    listed: list[ListedThread] = []
+    with concurrent.futures.ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(context,)
+    ) as executor:
+        thread_futures = [executor.submit(generate_threads, chunk, count) for chunk, count in iter_chunks(threads)]
+        stream_event_futures = [
+            executor.submit(generate_stream_events, chunk, count) for chunk, count in iter_chunks(stream_events)
+        ]
+        for thread_future in concurrent.futures.as_completed(thread_futures):
+            count, chunk_listed = thread_future.result()
+            total += count
+            listed.extend(chunk_listed)
+        for stream_event_future in concurrent.futures.as_completed(stream_event_futures):
+            total += stream_event_future.result()
+
+    return total + write_listings(output, context.channels, listed)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Generates synthetic dataset in the mock's data layout")
+    parser.add_argument(
+        "--output",
+        type=pathlib.Path,
+        required=True,
+        help="Directory the data files are written into, in the package layout (e.g. the package directory itself)",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--threads", type=int, default=1000)
+    parser.add_argument("--comments-per-thread", type=int, default=5)
+    parser.add_argument("--stream-events", type=int, default=1000)
+    parser.add_argument("--units", type=int, default=24)
+    parser.add_argument("--talents", type=int, default=100)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--channels", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    count = generate(
+        args.output,
+        seed=args.seed,
+        threads=args.threads,
+        comments_per_thread=args.comments_per_thread,
+        stream_events=args.stream_events,
+        units=max(1, args.units),
+        talents=max(1, args.talents),
+        users=max(1, args.users),
+        channels=max(1, args.channels),
+        workers=args.workers,
+    )
+    print(f"Generated {count} items into {args.output} in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import collections
+import collections.abc
+import os
+import pathlib
+import uuid
+from typing import Callable, Hashable, Iterator, TypeVar
+
+import msgspec
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+T = TypeVar("T")
+
+# Index large fixture directories on startup and decode the files only on first access
+LAZY_FIXTURES = os.getenv("HOLOPLUS_LAZY_FIXTURES", default="0") == "1"
+
+# Max number of decoded items kept in memory by every lazy map
+LAZY_FIXTURES_MAXSIZE = int(os.getenv("HOLOPLUS_LAZY_FIXTURES_MAXSIZE", default="1024"))
+
+
+class CacheInfo(msgspec.Struct, kw_only=True, frozen=True):
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: int
+    currsize: int
+
+
+class LazyMap(collections.abc.Mapping[K, V]):
+    """
+    Read-only mapping that knows only paths of its items, and loads the items on first access.
+
+    Loaded items are kept in LRU cache limited to `maxsize` items, so the memory usage does not depend
+    on the number of files. Iterating, `len()` and `in` use only the path index and don't load anything.
+    """
+
+    def __init__(self, paths: dict[K, pathlib.Path], load: Callable[[pathlib.Path], V], *, maxsize: int) -> None:
+        self.paths = paths
+        self.load = load
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._cache: collections.OrderedDict[K, V] = collections.OrderedDict()
+
+    @classmethod
+    def from_directory(
+        cls,
+        path: pathlib.Path,
+        load: Callable[[pathlib.Path], V],
+        *,
+        key: Callable[[str], K],
+        maxsize: int = LAZY_FIXTURES_MAXSIZE,
+    ) -> LazyMap[K, V]:
+        """Indexes every `{key}.json` file in the directory"""
+        return cls({key(item_path.stem): item_path for item_path in path.glob("*.json")}, load, maxsize=maxsize)
+
+    def __getitem__(self, key: K) -> V:
+        try:
+            value = self._cache[key]
+        except KeyError:
+            pass
+        else:
+            self.hits += 1
+            self._cache.move_to_end(key)
+            return value
+
+        # raises KeyError for unknown keys, without counting them as misses
+        path = self.paths[key]
+
+        self.misses += 1
+        value = self.load(path)
+        self._cache[key] = value
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+            self.evictions += 1
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.paths
+
+    def __iter__(self) -> Iterator[K]:
+        return iter(self.paths)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def map(self, func: Callable[[V], T], *, maxsize: int | None = None) -> LazyMap[K, T]:
+        """New lazy map with the same (shared) path index, that loads `func(item)` instead of the item"""
+        load = self.load
+        return LazyMap(self.paths, lambda path: func(load(path)), maxsize=self.maxsize if maxsize is None else maxsize)
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self._cache),
+        )
+
+    def cache_clear(self) -> None:
+        self._cache.clear()
+
+    def discard(self, key: K) -> None:
+        """Drops loaded item from cache, so that it's loaded again on next access"""
+        self._cache.pop(key, None)
+
+    def set_path(self, key: K, path: pathlib.Path | None) -> None:
+        """
+        Adds, replaces or (with `None`) removes item path, and drops the loaded item.
+        Path index is shared with maps created by `map()`, but their caches have to be discarded separately.
+        """
+        if path is None:
+            self.paths.pop(key, None)
+        else:
+            self.paths[key] = path
+        self.discard(key)
+
+
+def lazy_directory_map(
+    path: pathlib.Path,
+    load: Callable[[pathlib.Path], V],
+    *,
+    lazy: bool = LAZY_FIXTURES,
+) -> LazyMap[uuid.UUID, V] | None:
+    """
+    Indexes every `{uuid}.json` file in the directory with `lazy=True` (`HOLOPLUS_LAZY_FIXTURES=1`), see `LazyMap`.
+    Otherwise returns `None`, and the files are decoded by `FixtureStore` (not at all when served from bundle),
+    so nothing is decoded on import.
+    """
+    if lazy:
+        return LazyMap.from_directory(path, load, key=uuid.UUID)
+    return None
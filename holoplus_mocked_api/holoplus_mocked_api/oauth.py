@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import base64
+import collections
+import hashlib
+import hmac
+import os
+import secrets
+import time
+import urllib.parse
+import uuid
+from typing import Generic, TypeVar
+
+import msgspec
+from litestar.datastructures import State
+
+T = TypeVar("T")
+
+# Seconds (of real time) in which sign-in flow must be finished, unfinished flows and unused codes are evicted
+AUTH_FLOW_TTL = float(os.getenv("HOLOPLUS_AUTH_FLOW_TTL", default="600"))
+
+# Max number of pending sessions, codes and sign-ins (each), the oldest are evicted
+AUTH_FLOWS_MAXSIZE = int(os.getenv("HOLOPLUS_AUTH_FLOWS_MAXSIZE", default="100000"))
+
+CLIENT_ID = "H7HAzZpy8DnSDIoAohtafeU4pPBb1Ch9"
+REDIRECT_URI = "https://api.holoplus.com/v2/auth/callback"
+
+
+def s256(code_verifier: str) -> str:
+    """PKCE `S256` code challenge of the code verifier"""
+    return base64.urlsafe_b64encode(hashlib.sha256(code_verifier.encode()).digest()).rstrip(b"=").decode()
+
+
+class AuthSession(msgspec.Struct, kw_only=True, frozen=True):
+    """Sign-in flow started by `/v2/auth`, the code verifier never leaves the server"""
+
+    session_id: str
+    state: str
+    nonce: str
+    code_verifier: str
+    code_challenge: str
+
+
+class AuthorizationRequest(msgspec.Struct, kw_only=True, frozen=True):
+    """Query of `account.hololive.net/v1/ep/auth`"""
+
+    client_id: str
+    code_challenge: str
+    code_challenge_method: str
+    nonce: str
+    redirect_uri: str
+    response_type: str
+    scope: str
+    state: str
+
+    def query(self) -> str:
+        return urllib.parse.urlencode(msgspec.structs.asdict(self))
+
+
+class AuthorizationCode(msgspec.Struct, kw_only=True, frozen=True):
+    request: AuthorizationRequest
+    user_id: uuid.UUID
+    """Signed-in account"""
+
+
+class _ExpiringMap(Generic[T]):
+    """
+    Values that expire `ttl` seconds after they were added. All values have the same TTL,
+    so insertion order is also expiration order, and only the expired values at the start are visited.
+    """
+
+    def __init__(self, *, ttl: float, maxsize: int) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.evictions = 0
+        self._values: collections.OrderedDict[str, tuple[float, T]] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def put(self, key: str, value: T) -> None:
+        now = time.monotonic()
+        self._expire(now)
+        self._values[key] = (now + self.ttl, value)
+        if len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: str) -> T | None:
+        """Removes and returns the value, every value can be used only once"""
+        expires_at, value = self._values.pop(key, (0.0, None))
+        return value if expires_at > time.monotonic() else None
+
+    def _expire(self, now: float) -> None:
+        while self._values:
+            expires_at, _ = next(iter(self._values.values()))
+            if expires_at > now:
+                break
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+
+class AuthFlowStore:
+    """
+    Pending sign-in flows of both sides of the PKCE authorization code flow (see `/v2/auth`):
+
+    - sessions started by `/v2/auth`, with `state`, `nonce` and the code verifier, by `session_id`
+    - codes issued by `account.hololive.net/v1/ep/auth`, with the authorization request (and its code challenge)
+        and the signed-in account
+    - authorization requests waiting for the sign-in, by the state of the Google callback
+
+    Everything is single use and expires after `ttl`, and the oldest are evicted over `maxsize`,
+    so any number of abandoned flows doesn't grow the memory.
+    """
+
+    def __init__(self, *, ttl: float = AUTH_FLOW_TTL, maxsize: int = AUTH_FLOWS_MAXSIZE) -> None:
+        self.sessions: _ExpiringMap[AuthSession] = _ExpiringMap(ttl=ttl, maxsize=maxsize)
+        self.codes: _ExpiringMap[AuthorizationCode] = _ExpiringMap(ttl=ttl, maxsize=maxsize)
+        self.signins: _ExpiringMap[AuthorizationRequest] = _ExpiringMap(ttl=ttl, maxsize=maxsize)
+
+    def __len__(self) -> int:
+        return len(self.sessions) + len(self.codes) + len(self.signins)
+
+    def start(self) -> AuthSession:
+        code_verifier = secrets.token_urlsafe(32)
+        session = AuthSession(
+            session_id=secrets.token_urlsafe(32),
+            state=secrets.token_urlsafe(32),
+            nonce=secrets.token_urlsafe(32),
+            code_verifier=code_verifier,
+            code_challenge=s256(code_verifier),
+        )
+        self.sessions.put(session.session_id, session)
+        return session
+
+    def authorization_request(self, session: AuthSession) -> AuthorizationRequest:
+        return AuthorizationRequest(
+            client_id=CLIENT_ID,
+            code_challenge=session.code_challenge,
+            code_challenge_method="S256",
+            nonce=session.nonce,
+            redirect_uri=REDIRECT_URI,
+            response_type="code",
+            scope="openid profile",
+            state=session.state,
+        )
+
+    def issue_code(self, request: AuthorizationRequest, user_id: uuid.UUID) -> str:
+        code = secrets.token_urlsafe(32)
+        self.codes.put(code, AuthorizationCode(request=request, user_id=user_id))
+        return code
+
+    def exchange(self, *, session_id: str, state: str, code: str) -> uuid.UUID | None:
+        """
+        Returns the signed-in account of the code, or `None` if the session or code is unknown, used or expired,
+        or if they don't belong to the same flow (state, nonce and S256 challenge of the verifier must match)
+        """
+        session = self.sessions.pop(session_id)
+        authorization = self.codes.pop(code)
+        if session is None or authorization is None:
+            return None
+
+        request = authorization.request
+        if (
+            not hmac.compare_digest(session.state, state)
+            or not hmac.compare_digest(request.state, state)
+            or not hmac.compare_digest(request.nonce, session.nonce)
+            or request.code_challenge_method != "S256"
+            or not hmac.compare_digest(s256(session.code_verifier), request.code_challenge)
+        ):
+            return None
+        return authorization.user_id
+
+    def wait_for_signin(self, request: AuthorizationRequest) -> str:
+        """Keeps the authorization request until the sign-in finishes, returns state of the sign-in"""
+        state = secrets.token_urlsafe(32)
+        self.signins.put(state, request)
+        return state
+
+    def finish_signin(self, state: str) -> AuthorizationRequest | None:
+        return self.signins.pop(state)
+
+
+def provide_auth_flow_store(state: State) -> AuthFlowStore:
+    return state.auth_flow_store
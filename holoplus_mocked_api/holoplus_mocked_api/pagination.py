@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import bisect
+import collections
+import itertools
+import typing
+import uuid
+from typing import Any, Callable, Collection, Generic, Iterable, Mapping, Protocol, TypeVar
+
+import msgspec
+from litestar import status_codes
+
+from .enums import FilterLanguages
+from .exceptions import HoloplusException
+from .talents import TalentIndex
+
+T = TypeVar("T", bound="PaginatedItem")
+
+SortKey = tuple[int, int]
+
+ALL_LANGUAGES: tuple[str, ...] = typing.get_args(FilterLanguages)
+
+
+class PaginatedItem(Protocol):
+    @property
+    def id(self) -> uuid.UUID: ...
+
+    @property
+    def created_at(self) -> int: ...
+
+
+class InvalidCursorException(HoloplusException):
+    status_code = status_codes.HTTP_400_BAD_REQUEST  # TODO: verify
+    holoplus_code = "Bad Request"
+    holoplus_detail = "invalid cursor"
+
+
+def sort_key(item: PaginatedItem) -> SortKey:
+    """Sorts items newest first, by `(created_at, id)` descending"""
+    return -item.created_at, -item.id.int
+
+
+def format_cursor(item: PaginatedItem) -> str:
+    return f"{item.created_at}#{item.id}"
+
+
+def parse_cursor(cursor: str) -> tuple[int, uuid.UUID]:
+    """
+    Parses `created_at#uuid` cursor of the last item of previous page.
+    Cursors of some endpoints have extra prefix (e.g. `#en#1757126335#96d6d699-...:1757126335#96d6d699-...`),
+    only the trailing `created_at#uuid` is used.
+    """
+    try:
+        created_at, id_ = cursor.rsplit(":", 1)[-1].split("#")[-2:]
+        return int(created_at), uuid.UUID(id_)
+    except ValueError as e:
+        raise InvalidCursorException() from e
+
+
+def cursor_sort_key(cursor: str) -> SortKey:
+    created_at, id_ = parse_cursor(cursor)
+    return -created_at, -id_.int
+
+
+def content_languages(original_language: str | None, translations: Mapping[str, Any] | Any) -> set[str]:
+    """Languages that thread or comment can be read in, original and translated"""
+    languages = set(translations) if isinstance(translations, Mapping) else set()
+    if original_language:
+        languages.add(original_language)
+    return languages
+
+
+class Page(msgspec.Struct, Generic[T], kw_only=True, frozen=True):
+    items: list[T]
+    next_cursor: str | None
+    """Cursor of the last item, `None` when there are no more items"""
+
+    @property
+    def has_next_items(self) -> bool:
+        return self.next_cursor is not None
+
+
+class Paginator(Generic[T]):
+    """
+    Collection of listing items, paginated by cursor (of the last item of previous page) or offset.
+
+    With `newest_first`, items are sorted once by `(created_at, id)`, newest first, and pages are found
+    by binary search on the sort keys. Otherwise items keep their order (e.g. by popularity or update time),
+    and the cursor item is looked up by its id. Either way every request is O(log n + limit).
+
+    With `languages`, items are also split into sorted sub-collections of every language on load,
+    so `filter_language` is a dict lookup instead of filtering all items on every request.
+    Items without any language are in all of them.
+
+    With `talents`, items (of every language) are also indexed by talents, see `TalentIndex`,
+    and pages can be limited to items featuring any of the given talents.
+
+    With `truncated`, the items are only the first page of longer listing (captured with `next_cursor`
+    or `has_next_items`), so the last page has next items too, same as the unpaginated fixture.
+    """
+
+    def __init__(
+        self,
+        items: Iterable[T],
+        *,
+        newest_first: bool = False,
+        truncated: bool = False,
+        languages: Callable[[T], Collection[str]] | None = None,
+        talents: Callable[[T], Iterable[uuid.UUID]] | None = None,
+    ) -> None:
+        self.items = sorted(items, key=sort_key) if newest_first else list(items)
+        self.newest_first = newest_first
+        self.truncated = truncated
+        self._keys = [sort_key(item) for item in self.items] if newest_first else []
+        self._positions = {item.id: position for position, item in enumerate(self.items)}
+        self._talents = talents
+        self._languages: dict[str, Paginator[T]] | None = None
+        self._talent_index = TalentIndex(self.items, talents) if talents is not None else None
+
+        if languages is not None:
+            language_items: dict[str, list[T]] = collections.defaultdict(list)
+            for item in self.items:
+                for language in languages(item) or ALL_LANGUAGES:
+                    language_items[language].append(item)
+            self._languages = {
+                language: Paginator(items, newest_first=newest_first, truncated=truncated, talents=talents)
+                for language, items in language_items.items()
+            }
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def get(self, item_id: uuid.UUID, *, talent_ids: Collection[uuid.UUID] | None = None) -> T | None:
+        """
+        Item by id, `None` if it's not in the (filtered) collection,
+        or with `talent_ids` if it doesn't feature any of the talents
+        """
+        position = self._positions.get(item_id)
+        if position is None:
+            return None
+        item = self.items[position]
+        if talent_ids is None:
+            return item
+        if self._talents is None:
+            raise ValueError("Items are not indexed by talents")
+        return item if any(talent_id in talent_ids for talent_id in self._talents(item)) else None
+
+    def filter(self, language: str | None) -> Paginator[T]:
+        """Items in the language, all items when language is not set or items are not indexed by language"""
+        if language is None or self._languages is None:
+            return self
+        return self._languages.get(language) or Paginator([], newest_first=self.newest_first)
+
+    def page(
+        self,
+        *,
+        limit: int,
+        cursor: str | None = None,
+        offset: int = 0,
+        talent_ids: Collection[uuid.UUID] | None = None,
+    ) -> Page[T]:
+        """
+        Returns `limit` items after the `cursor` item (or from the start), skipping first `offset` items.
+        With `talent_ids`, only items featuring any of the talents are returned (and skipped by `offset`).
+        """
+        start = self._cursor_start(cursor) if cursor else 0
+
+        if talent_ids is None:
+            start += offset
+            items = self.items[start : start + limit]
+            has_next_items = start + limit < len(self.items)
+        else:
+            if self._talent_index is None:
+                raise ValueError("Items are not indexed by talents")
+            positions = itertools.islice(self._talent_index.positions(talent_ids, start), offset, offset + limit + 1)
+            items = [self.items[position] for position in positions]
+            has_next_items = len(items) > limit
+            del items[limit:]
+
+        has_next_items = has_next_items or self.truncated
+        return Page(items=items, next_cursor=format_cursor(items[-1]) if has_next_items and items else None)
+
+    def _cursor_start(self, cursor: str) -> int:
+        """Position of the first item after the cursor item"""
+        if self.newest_first:
+            return bisect.bisect_right(self._keys, cursor_sort_key(cursor))
+
+        _, item_id = parse_cursor(cursor)
+        if (position := self._positions.get(item_id)) is None:
+            raise InvalidCursorException()
+        return position + 1
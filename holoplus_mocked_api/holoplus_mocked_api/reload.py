@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import collections.abc
+import contextlib
+import logging
+import os
+import pathlib
+import time
+from typing import Any, AsyncIterator, Callable, Hashable, Iterable
+
+import anyio
+import anyio.to_thread
+import litestar
+import msgspec
+
+from .fixtures import Fixture, FixtureRoute, FixtureStore
+from .lazy import LazyMap
+
+_logger = logging.getLogger(__name__)
+
+# Watch `data/` directories and reload changed fixtures without restarting the app
+WATCH_FIXTURES = os.getenv("HOLOPLUS_WATCH_FIXTURES", default="0") == "1"
+
+
+class FixtureChange(msgspec.Struct, kw_only=True, frozen=True):
+    route: FixtureRoute
+    key: Hashable
+    path: pathlib.Path
+    deleted: bool = False
+    value: msgspec.Struct | None = None
+    """New value, not set for deleted files and for lazily loaded routes"""
+    fixture: Fixture | None = None
+
+
+class FixtureWatcher:
+    """
+    Watches data files of fixture routes, and reloads only the fixtures whose files changed.
+
+    Changed files are decoded in worker thread, and then swapped into the store (and into the route `values`)
+    all at once, so requests see either old or new state of all of them.
+    Files that fail to decode are logged and skipped, the old fixture is kept.
+
+    Data built from the fixtures outside of the store (e.g. `StreamSchedule`) is rebuilt by `on_reload` callbacks,
+    that get names of the changed routes, and are called right after the swap.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        routes: Iterable[FixtureRoute],
+        *,
+        on_reload: Iterable[Callable[[set[str]], None]] = (),
+    ) -> None:
+        self.store = store
+        self.routes = [route for route in routes if route.path is not None]
+        self.on_reload = list(on_reload)
+
+    @property
+    def watch_paths(self) -> list[pathlib.Path]:
+        paths = {route.path if route.path.is_dir() else route.path.parent for route in self.routes if route.path}
+        return sorted(paths)
+
+    def resolve(self, path: pathlib.Path) -> list[tuple[FixtureRoute, Hashable]]:
+        """Routes and keys of fixtures loaded from the file"""
+        return [(route, route.path_key(path)) for route in self.routes if route.match(path)]
+
+    def load_changes(self, paths: Iterable[pathlib.Path]) -> list[FixtureChange]:
+        """Decodes changed files and creates new fixtures, runs in worker thread"""
+        changes: list[FixtureChange] = []
+        for path in paths:
+            for route, key in self.resolve(path):
+                if not path.exists():
+                    changes.append(FixtureChange(route=route, key=key, path=path, deleted=True))
+                elif isinstance(route.values, LazyMap) and self.store.is_lazy(route.name):
+                    # loaded again on next request
+                    changes.append(FixtureChange(route=route, key=key, path=path))
+                else:
+                    try:
+                        value = route.load_path(path)
+                        fixture = Fixture.from_value(
+                            value, encoded=self.store.encoded, compression_encodings=self.store.compression_encodings
+                        )
+                    except Exception:
+                        _logger.exception("Failed to reload fixture %s from %s", route.name, path)
+                        continue
+                    changes.append(FixtureChange(route=route, key=key, path=path, value=value, fixture=fixture))
+        return changes
+
+    def apply_changes(self, changes: list[FixtureChange]) -> None:
+        """Swaps changes into the store and the route values, must not yield to the event loop"""
+        for change in changes:
+            values = change.route.values
+            if isinstance(values, LazyMap):
+                values.set_path(change.key, None if change.deleted else change.path)
+            elif isinstance(values, collections.abc.MutableMapping):
+                if change.value is None:
+                    values.pop(change.key, None)
+                else:
+                    values[change.key] = change.value
+
+        self.store.update({(change.route.name, change.key): change.fixture for change in changes})
+
+        route_names = {change.route.name for change in changes}
+        if route_names:
+            for callback in self.on_reload:
+                callback(route_names)
+
+    async def reload(self, paths: Iterable[pathlib.Path]) -> int:
+        """Reloads fixtures of changed files, returns number of swapped fixtures"""
+        start = time.perf_counter()
+        changes = await anyio.to_thread.run_sync(self.load_changes, list(paths))
+        self.apply_changes(changes)
+        if changes:
+            _logger.info(
+                "Reloaded %s fixtures in %.3fs: %s",
+                len(changes),
+                time.perf_counter() - start,
+                ", ".join(sorted({change.route.name for change in changes})),
+            )
+        return len(changes)
+
+    async def run(self) -> None:
+        # installed with `litestar[standard]`
+        import watchfiles
+
+        _logger.info("Watching fixtures in %s", ", ".join(str(path) for path in self.watch_paths))
+        async for file_changes in watchfiles.awatch(*self.watch_paths, recursive=False):
+            await self.reload(pathlib.Path(path) for _, path in file_changes)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(self, app: litestar.Litestar) -> AsyncIterator[Any]:
+        async with anyio.create_task_group() as tg:
+            tg.start_soon(self.run)
+            yield
+            tg.cancel_scope.cancel()
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING, Any, cast
+
+import litestar
+from litestar import status_codes
+from litestar.response.base import ASGIResponse
+from litestar.serialization import default_serializer
+
+from .compression import encoded_etag, on_the_fly_encoding, select_encoding
+
+if TYPE_CHECKING:
+    from litestar.background_tasks import BackgroundTask, BackgroundTasks
+    from litestar.datastructures import Cookie
+    from litestar.enums import MediaType
+    from litestar.types import Serializer, TypeEncodersMap
+
+# Headers that are sent with `304 Not Modified` response, see RFC 9110, section 15.4.5
+NOT_MODIFIED_HEADERS = {"cache-control", "content-location", "date", "etag", "expires", "vary"}
+
+
+def compute_etag(body: bytes | memoryview) -> str:
+    """Strong ETag of encoded response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Checks `If-None-Match` header value against ETag.
+    Uses weak comparison, as required for `If-None-Match` by RFC 9110.
+    """
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == "*":
+        return True
+
+    return any(value.strip().removeprefix("W/") == etag for value in if_none_match.split(","))
+
+
+def matching_etag(request: litestar.Request, etag: str) -> str | None:
+    """
+    ETag matching `If-None-Match` of the request, either the ETag itself,
+    or ETag of the variant compressed on the fly by `CompressionMiddleware`.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, etag):
+        return etag
+    if (encoding := on_the_fly_encoding(request.scope)) and etag_matches(
+        if_none_match, compressed := encoded_etag(etag, encoding)
+    ):
+        return compressed
+    return None
+
+
+class ETagResponse(litestar.Response):
+    """
+    Response that gets ETag computed from its encoded body,
+    and that is replaced by empty `304 Not Modified` when it matches `If-None-Match` request header.
+
+    Used as default response class of the app, so it also covers responses computed on request.
+    """
+
+    def to_asgi_response(
+        self,
+        app: litestar.Litestar | None,
+        request: litestar.Request,
+        *,
+        background: BackgroundTask | BackgroundTasks | None = None,
+        cookies: Any = None,
+        encoded_headers: Any = None,
+        headers: dict[str, str] | None = None,
+        is_head_response: bool = False,
+        media_type: MediaType | str | None = None,
+        status_code: int | None = None,
+        type_encoders: TypeEncodersMap | None = None,
+    ) -> ASGIResponse:
+        response = super().to_asgi_response(
+            app,
+            request,
+            background=background,
+            cookies=cookies,
+            encoded_headers=encoded_headers,
+            headers=headers,
+            is_head_response=is_head_response,
+            media_type=media_type,
+            status_code=status_code,
+            type_encoders=type_encoders,
+        )
+        if request.method != "GET" or response.status_code != status_codes.HTTP_200_OK or "etag" in response.headers:
+            return response
+
+        etag = compute_etag(response.body)
+        if matched := matching_etag(request, etag):
+            return not_modified_response(matched, headers=self.headers, cookies=self.cookies)
+
+        response.headers["etag"] = etag
+        return response
+
+
+class FixtureResponse(ETagResponse):
+    """
+    Response with ETag computed when the fixture was loaded.
+    When `If-None-Match` matches, the content is not encoded at all.
+
+    If the client accepts one of `compressed` encodings, the precompressed body is sent instead of the content.
+    Every compressed variant has its own ETag, as required for strong ETags.
+    """
+
+    def __init__(
+        self, content: Any, *, etag: str, compressed: dict[str, bytes | memoryview] | None = None, **kwargs: Any
+    ) -> None:
+        super().__init__(content, **kwargs)
+        self.etag = etag
+        self.compressed = compressed or {}
+
+    def to_asgi_response(
+        self,
+        app: litestar.Litestar | None,
+        request: litestar.Request,
+        **kwargs: Any,
+    ) -> ASGIResponse:
+        if self.compressed:
+            self.headers["vary"] = "Accept-Encoding"
+            if encoding := select_encoding(request.headers.get("accept-encoding"), self.compressed):
+                self.content = self.compressed[encoding]
+                self.etag = encoded_etag(self.etag, encoding)
+                self.headers["content-encoding"] = encoding
+
+        self.headers["etag"] = self.etag
+        if request.method == "GET" and (matched := matching_etag(request, self.etag)):
+            return not_modified_response(matched, headers=self.headers, cookies=self.cookies)
+
+        return super().to_asgi_response(app, request, **kwargs)
+
+    def render(self, content: Any, media_type: str, enc_hook: Serializer = default_serializer) -> bytes:
+        if isinstance(content, memoryview):
+            # body from memory-mapped bundle is sent as slice of the mapping, without copying it,
+            # ASGI servers write the body to the transport, that takes any bytes-like object
+            return cast("bytes", content)
+        return super().render(content, media_type, enc_hook)
+
+
+def not_modified_response(
+    etag: str, *, headers: dict[str, Any] | None = None, cookies: list[Cookie] | None = None
+) -> ASGIResponse:
+    headers = {k: v for k, v in (headers or {}).items() if k.lower() in NOT_MODIFIED_HEADERS}
+    return ASGIResponse(
+        status_code=status_codes.HTTP_304_NOT_MODIFIED,
+        headers={**headers, "etag": etag},
+        cookies=cookies,
+    )
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import array
+import bisect
+import collections
+import heapq
+import uuid
+from typing import Callable, Collection, Generic, Iterable, Iterator, Sequence, TypeVar
+
+from .users import UserDirectory
+
+T = TypeVar("T")
+
+
+class TalentIndex(Generic[T]):
+    """
+    Positions of items of ordered listing (threads, stream events) by the talents they feature.
+
+    Every talent has sorted array of item positions, so filtering by favorite talents is a merge
+    of the arrays of those talents only, starting at the requested position. The merged positions keep
+    the order of the listing, so the listing never has to be scanned or sorted on request.
+    """
+
+    def __init__(self, items: Sequence[T], talents: Callable[[T], Iterable[uuid.UUID]]) -> None:
+        self.items = items
+
+        positions: dict[uuid.UUID, array.array[int]] = collections.defaultdict(lambda: array.array("I"))
+        for position, item in enumerate(items):
+            for talent_id in set(talents(item)):
+                positions[talent_id].append(position)
+        self._positions = dict(positions)
+
+    def __len__(self) -> int:
+        """Number of indexed talents"""
+        return len(self._positions)
+
+    def positions(self, talent_ids: Collection[uuid.UUID], start: int = 0) -> Iterator[int]:
+        """Yields positions of items featuring any of the talents, from `start`, in listing order"""
+        iterators: list[Iterator[int]] = []
+        for talent_id in talent_ids:
+            if (positions := self._positions.get(talent_id)) is not None:
+                first = bisect.bisect_left(positions, start)
+                iterators.append(map(positions.__getitem__, range(first, len(positions))))
+
+        last = -1
+        for position in heapq.merge(*iterators):
+            if position != last:
+                yield position
+                last = position
+
+    def filter(self, talent_ids: Collection[uuid.UUID], start: int = 0) -> Iterator[T]:
+        """Yields items featuring any of the talents, from `start`, in listing order"""
+        for position in self.positions(talent_ids, start):
+            yield self.items[position]
+
+
+class FavoriteTalents(frozenset[uuid.UUID]):
+    """Ids of favorite talents (oshi) of the user record, kept in user session"""
+
+
+def favorite_talent_ids(users: UserDirectory, user_id: uuid.UUID) -> frozenset[uuid.UUID]:
+    """Favorite talents of the user, collected from its user record once per session"""
+    session = users[user_id]
+    return session.setdefault(FavoriteTalents, lambda: FavoriteTalents(talent.id for talent in session.user.talents))
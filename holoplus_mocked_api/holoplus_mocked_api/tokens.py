@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import heapq
+import hmac
+import os
+import threading
+import uuid
+from typing import Literal
+
+import msgspec
+from litestar.datastructures import State
+
+from .clock import VirtualClock
+
+# Secret the mocked tokens are signed with, must be the same for all workers
+JWT_SECRET = os.getenv("HOLOPLUS_JWT_SECRET", default="holoplus-mocked-api")
+
+# Max number of verified tokens whose claims are cached
+TOKEN_CACHE_MAXSIZE = int(os.getenv("HOLOPLUS_TOKEN_CACHE_MAXSIZE", default="10000"))
+
+# Virtual seconds after which the tokens expire
+ID_TOKEN_LIFETIME = 3600
+REFRESH_TOKEN_LIFETIME = 365 * 24 * 3600
+CUSTOM_TOKEN_LIFETIME = 3600
+
+TokenUse = Literal["id", "refresh", "custom"]
+"""`custom` is the Firebase custom token returned by `/v2/auth/token`"""
+
+_LIFETIMES: dict[TokenUse, int] = {
+    "id": ID_TOKEN_LIFETIME,
+    "refresh": REFRESH_TOKEN_LIFETIME,
+    "custom": CUSTOM_TOKEN_LIFETIME,
+}
+
+PROJECT_ID = "102023860511"
+
+
+class TokenClaims(msgspec.Struct, kw_only=True, frozen=True):
+    iss: str
+    aud: str
+    sub: str
+    user_id: uuid.UUID
+    iat: int
+    exp: int
+    token_use: TokenUse
+    """Not in real tokens, real refresh tokens are opaque"""
+
+
+def _b64encode(data: bytes) -> bytes:
+    return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+
+def _b64decode(data: str) -> bytes:
+    return base64.urlsafe_b64decode(data + "=" * (-len(data) % 4))
+
+
+_HEADER = _b64encode(msgspec.json.encode({"alg": "HS256", "typ": "JWT"})).decode()
+
+
+class TokenIssuer:
+    """
+    Mints and verifies the ID and refresh tokens returned by the googleapis.com endpoints,
+    and the Firebase custom tokens returned by `/v2/auth/token`.
+
+    Tokens are real JWTs signed with HS256 by local secret, so that clients can parse them and test their expiry
+    handling. Expiration is in virtual time (see `VirtualClock`).
+
+    Verified claims are cached by token, so the signature of every token is checked only once. Cached tokens
+    are evicted when they expire (the soonest expiring are found with heap), and the soonest expiring ones
+    are also evicted when the cache is full.
+    """
+
+    def __init__(self, clock: VirtualClock, *, secret: str = JWT_SECRET, maxsize: int = TOKEN_CACHE_MAXSIZE) -> None:
+        self.clock = clock
+        self.maxsize = maxsize
+        self._secret = secret.encode()
+        self._claims: dict[str, TokenClaims] = {}
+        self._expirations: list[tuple[int, str]] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._claims)
+
+    def _sign(self, signing_input: bytes) -> bytes:
+        return _b64encode(hmac.digest(self._secret, signing_input, hashlib.sha256))
+
+    def mint(self, user_id: uuid.UUID, token_use: TokenUse = "id") -> str:
+        now = int(self.clock.time())
+        claims = TokenClaims(
+            iss=f"https://securetoken.google.com/{PROJECT_ID}",
+            aud=PROJECT_ID,
+            sub=str(user_id),
+            user_id=user_id,
+            iat=now,
+            exp=now + _LIFETIMES[token_use],
+            token_use=token_use,
+        )
+        signing_input = f"{_HEADER}.".encode() + _b64encode(msgspec.json.encode(claims))
+        return (signing_input + b"." + self._sign(signing_input)).decode()
+
+    def issued(self, token: str) -> bool:
+        """Whether the token looks like one minted by this issuer (it may still be invalid or expired)"""
+        return token.removeprefix("Bearer ").startswith(f"{_HEADER}.")
+
+    def verify(self, token: str) -> TokenClaims | None:
+        """Returns claims of valid token (with or without `Bearer ` prefix), `None` for invalid or expired tokens"""
+        token = token.removeprefix("Bearer ")
+        now = self.clock.time()
+
+        if (claims := self._claims.get(token)) is not None:
+            return claims if claims.exp > now else None
+
+        # only tokens minted by this issuer are accepted, so the header must be exactly the same
+        header, _, rest = token.partition(".")
+        payload, _, signature = rest.partition(".")
+        if header != _HEADER or not hmac.compare_digest(self._sign(f"{header}.{payload}".encode()), signature.encode()):
+            return None
+        try:
+            claims = msgspec.json.decode(_b64decode(payload), type=TokenClaims)
+        except (binascii.Error, msgspec.DecodeError):
+            return None
+        if claims.exp <= now:
+            return None
+
+        with self._lock:
+            self._evict(now)
+            self._claims[token] = claims
+            heapq.heappush(self._expirations, (claims.exp, token))
+        return claims
+
+    def _evict(self, now: float) -> None:
+        while self._expirations and (self._expirations[0][0] <= now or len(self._claims) >= self.maxsize):
+            _, token = heapq.heappop(self._expirations)
+            self._claims.pop(token, None)
+
+
+def provide_token_issuer(state: State) -> TokenIssuer:
+    return state.token_issuer
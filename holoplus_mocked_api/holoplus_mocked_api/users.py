@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import collections
+import functools
+import os
+import time
+import uuid
+from typing import TYPE_CHECKING, Callable, TypeVar
+
+import msgspec
+from litestar.datastructures import State
+
+from .exceptions import HoloplusInvalidTokenException
+from .lazy import CacheInfo
+
+if TYPE_CHECKING:
+    from .tokens import TokenIssuer
+    from .v1.models import Me
+
+T = TypeVar("T")
+
+# Max number of user sessions kept in memory, least recently used sessions are evicted
+SESSIONS_MAXSIZE = int(os.getenv("HOLOPLUS_SESSIONS_MAXSIZE", default="10000"))
+
+# Seconds (of real time) after which idle user sessions are evicted
+SESSION_TTL = float(os.getenv("HOLOPLUS_SESSION_TTL", default="3600"))
+
+
+class UserSession:
+    """
+    User record and mutable per-user state (favorites, pins, reactions...) of one user.
+
+    Every feature keeps its own state object in the session, keyed by the class of the object,
+    so the session doesn't need to know about the features.
+    """
+
+    __slots__ = ("_state", "last_access", "user")
+
+    def __init__(self, user: Me) -> None:
+        self.user = user
+        self.last_access = time.monotonic()
+        self._state: dict[type, object] = {}
+
+    def get(self, cls: type[T]) -> T | None:
+        """Returns state object of the class, or `None` when the user has none yet"""
+        return self._state.get(cls)  # type: ignore[return-value]
+
+    def setdefault(self, cls: type[T], factory: Callable[[], T] | None = None) -> T:
+        """Returns state object of the class, creates it with `factory` (default is the class) when missing"""
+        if (value := self._state.get(cls)) is None:
+            value = self._state.setdefault(cls, (factory or cls)())
+        return value  # type: ignore[return-value]
+
+    def set(self, value: object) -> None:
+        """Replaces state object of the same class"""
+        self._state[type(value)] = value
+
+
+def user_id_for_token(template: Me, token: str) -> uuid.UUID:
+    """Stable user id derived from opaque token (or from Firebase custom token)"""
+    return _uuid5(template.id, token)
+
+
+@functools.lru_cache(maxsize=SESSIONS_MAXSIZE)
+def _uuid5(namespace: uuid.UUID, name: str) -> uuid.UUID:
+    # cached, because opaque tokens are resolved on every request
+    return uuid.uuid5(namespace, name)
+
+
+def user_for_id(template: Me, user_id: uuid.UUID) -> Me:
+    """User record of the user, same as the template (mocked `/v1/me` user), but with its own id"""
+    return msgspec.structs.replace(template, id=user_id)
+
+
+class UserDirectory:
+    """
+    Users of all `authorization` tokens, so that every client gets its own user and state.
+
+    Tokens minted by `TokenIssuer` belong to the user of their `user_id` claim, so the user keeps its state
+    when the token is refreshed. Any other token is accepted as opaque token of user with id derived from it.
+    Tokens are resolved to user ids once per request (see `AuthenticationMiddleware`), sessions are keyed by user id.
+
+    Sessions are created on first access and kept in LRU order. Sessions idle for longer than `ttl`
+    and least recently used sessions over `maxsize` are evicted (with all their state), so any number
+    of distinct tokens can be used without growing the memory.
+    Evicted users get a new session with the same user record (but empty state) on next access.
+
+    Per-user state (e.g. reaction counts, see `ReactionCounters`) lives only in the sessions. All handlers run
+    on one event loop, so sessions are accessed without locks.
+    """
+
+    def __init__(
+        self,
+        template: Me,
+        *,
+        maxsize: int = SESSIONS_MAXSIZE,
+        ttl: float = SESSION_TTL,
+        tokens: TokenIssuer | None = None,
+        user: Callable[[Me, uuid.UUID], Me] = user_for_id,
+    ) -> None:
+        self.template = template
+        self.tokens = tokens
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.user = user
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._sessions: collections.OrderedDict[uuid.UUID, UserSession] = collections.OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def user_id(self, token: str) -> uuid.UUID:
+        """
+        User id of the token, raises `HoloplusInvalidTokenException` for invalid or expired minted tokens,
+        and for minted tokens that are not ID tokens (refresh and custom tokens are not accepted by the API)
+        """
+        if self.tokens is not None and self.tokens.issued(token):
+            if (claims := self.tokens.verify(token)) is None or claims.token_use != "id":
+                raise HoloplusInvalidTokenException()
+            return claims.user_id
+        return user_id_for_token(self.template, token)
+
+    def __getitem__(self, user_id: uuid.UUID) -> UserSession:
+        """Returns session of the user, creates it when missing"""
+        if (session := self._touch(user_id)) is not None:
+            return session
+
+        self.misses += 1
+        session = self._sessions[user_id] = UserSession(self.user(self.template, user_id))
+        if len(self._sessions) > self.maxsize:
+            self._sessions.popitem(last=False)
+            self.evictions += 1
+        return session
+
+    def get(self, user_id: uuid.UUID) -> UserSession | None:
+        """Returns session of the user, or `None` if the user has none, so that reads don't create sessions"""
+        return self._touch(user_id)
+
+    def _touch(self, user_id: uuid.UUID) -> UserSession | None:
+        now = time.monotonic()
+        self._expire(now)
+
+        session = self._sessions.get(user_id)
+        if session is not None:
+            self.hits += 1
+            session.last_access = now
+            self._sessions.move_to_end(user_id)
+        return session
+
+    def _expire(self, now: float) -> None:
+        # sessions are in access order, so only the expired ones at the start are visited
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if now - session.last_access < self.ttl:
+                break
+            del self._sessions[session.user.id]
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        return CacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            maxsize=self.maxsize,
+            currsize=len(self._sessions),
+        )
+
+
+def provide_user_directory(state: State) -> UserDirectory:
+    return state.user_directory
@@ -7,7 +7,11 @@ from litestar.types import ControllerRouterHandler
 from litestar.params import Body, Parameter
 from litestar.openapi.spec import Example
 
+from holoplus_mocked_api.auth import AuthRequest
+from holoplus_mocked_api.clock import VirtualClock
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute
+from holoplus_mocked_api.users import UserDirectory
 
 from .models import (
     Application,
@@ -16,21 +20,22 @@ from .models import (
     MeAgreement,
     MeAgreementsResponse,
     PushNotificationGroupsResponse,
+    MePushNotificationSetting,
     MePushNotificationSettingsPutRequest,
     MeDevice,
 )
-from .data import AGREEMENTS_MAP, ME, PUSH_NOTIFICATION_GROUPS
+from .data import AGREEMENTS_MAP, PUSH_NOTIFICATION_GROUPS
+
+# `/v1/me` is the user of the token, see `UserDirectory`
+FIXTURE_ROUTES: list[FixtureRoute] = []
 
 
 @litestar.get("/v1/agreements", summary="/v1/agreements")
-async def v1__agreements(
-    *,
-    token: Annotated[str, Parameter(header="authorization")],
-) -> AgreementsResponse:
+async def v1__agreements() -> AgreementsResponse:
     return AgreementsResponse(items=[AGREEMENTS_MAP["privacy_policy"], AGREEMENTS_MAP["term"]])
 
 
-@litestar.get("/v1/application", summary="/v1/application")
+@litestar.get("/v1/application", summary="/v1/application", exclude_from_auth=True)
 async def v1__application() -> Application:
     """
     Doesn't need Authorization header.
@@ -39,26 +44,21 @@ async def v1__application() -> Application:
 
 
 @litestar.get("/v1/push_notification_settings", summary="/v1/push_notification_settings")
-async def v1__push_notification_settings(
-    *,
-    token: Annotated[str, Parameter(header="authorization")],
-) -> PushNotificationGroupsResponse:
+async def v1__push_notification_settings() -> PushNotificationGroupsResponse:
     return PushNotificationGroupsResponse(items=PUSH_NOTIFICATION_GROUPS)
 
 
 @litestar.get("/v1/me", summary="/v1/me")
 async def v1__me(
     *,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    users: UserDirectory,
 ) -> Me:
-    return ME
+    return users[request.user].user
 
 
 @litestar.get("/v1/me/agreements", summary="/v1/me/agreements")
-async def v1__me__agreements(
-    *,
-    token: Annotated[str, Parameter(header="authorization")],
-) -> MeAgreementsResponse:
+async def v1__me__agreements() -> MeAgreementsResponse:
     return MeAgreementsResponse(
         items=[MeAgreement(agreement=AGREEMENTS_MAP["privacy_policy"]), MeAgreement(agreement=AGREEMENTS_MAP["term"])]
     )
@@ -68,9 +68,21 @@ async def v1__me__agreements(
 async def v1__me__push_notification_settings(
     data: Annotated[MePushNotificationSettingsPutRequest, Body()],
     *,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    users: UserDirectory,
 ) -> Me:
-    return ME
+    # TODO: verify that the request replaces all enabled settings
+    setting_ids = set(data.setting_ids)
+    session = users[request.user]
+    session.user.push_notification_settings = [
+        MePushNotificationSetting(
+            id=setting.id, sname=setting.sname, created_at=setting.created_at, updated_at=setting.updated_at
+        )
+        for group in PUSH_NOTIFICATION_GROUPS
+        for setting in group.push_notification_settings
+        if setting.id in setting_ids
+    ]
+    return session.user
 
 
 @litestar.put(
@@ -80,13 +92,14 @@ async def v1__me__devices(
     *,
     device_id: Annotated[str, Parameter(examples=[Example(value="00000b988c2b9c52")])],
     fcm_registration_token: Annotated[str, Parameter(header="fcm-registration-token")],
-    token: Annotated[str, Parameter(header="authorization")],
+    clock: VirtualClock,
 ) -> MeDevice:
+    now = int(clock.time())
     return MeDevice(
         id=device_id,
         fcm_token=fcm_registration_token,
-        created_at=1757169645,
-        updated_at=1757169645,
+        created_at=now,
+        updated_at=now,
     )
 
 
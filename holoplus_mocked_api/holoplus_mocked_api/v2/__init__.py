@@ -12,7 +12,10 @@ from litestar.params import Body, Parameter
 from litestar.openapi.spec import Example
 
 from holoplus_mocked_api.enums import FilterLanguages
-from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.exceptions import HoloplusException, HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute, FixtureStore
+from holoplus_mocked_api.oauth import AuthFlowStore
+from holoplus_mocked_api.tokens import TokenIssuer
 
 from .models import (
     AuthResponse,
@@ -25,7 +28,14 @@ from .models import (
     Group,
     Unit,
 )
-from .data import COMMUNITIES_MAP, BANNERS_MAP, MODULES_MAP, GROUPS_MAP, UNITS_MAP
+from .data import ROOT_PATH as DATA_PATH, COMMUNITIES_MAP, BANNERS_RESPONSE, MODULES_RESPONSE, GROUPS_MAP, UNITS_MAP
+
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(name="v2__banners", values={None: BANNERS_RESPONSE}),
+    FixtureRoute(name="v2__modules", values={None: MODULES_RESPONSE}),
+    FixtureRoute(name="v2__groups", path=DATA_PATH / "groups", model=Group, key=uuid.UUID, values=GROUPS_MAP),
+    FixtureRoute(name="v2__units", path=DATA_PATH / "units", model=Unit, key=uuid.UUID, values=UNITS_MAP),
+]
 
 
 class GroupNotFoundException(HoloplusNotFoundException):
@@ -36,8 +46,15 @@ class UnitNotFoundException(HoloplusNotFoundException):
     holoplus_detail = "error getting unit by id: unit not found"
 
 
-@litestar.get("/v2/auth", summary="/v2/auth")
-async def v2__auth() -> AuthResponse:
+class InvalidAuthCodeException(HoloplusException):
+    status_code = status_codes.HTTP_400_BAD_REQUEST  # TODO: verify
+    holoplus_code = "Bad Request"
+    holoplus_message = "Authentication failed😢\nPlease check your internet connection and try again!"
+    holoplus_detail = "invalid or expired authorization code"
+
+
+@litestar.get("/v2/auth", summary="/v2/auth", exclude_from_auth=True)
+async def v2__auth(auth_flows: AuthFlowStore) -> AuthResponse:
     """
     Auth algorithm:
     - App calls this endpoint, gets `https://account.hololive.net/v1/ep/auth?****` url, and opens it in browser
@@ -51,25 +68,19 @@ async def v2__auth() -> AuthResponse:
         - `POST DATA: {"token": "FIREBASE-TOKEN", "returnSecureToken": true}`
         - `key` is `x-goog-api-key`
     """
-    query = urllib.parse.urlencode(
-        {
-            "client_id": "H7HAzZpy8DnSDIoAohtafeU4pPBb1Ch9",
-            "code_challenge": "**-****************************************",
-            "code_challenge_method": "S256",
-            "nonce": "*******************************************",
-            "redirect_uri": "https://api.holoplus.com/v2/auth/callback",
-            "response_type": "code",
-            "scope": "openid+profile",
-            "state": "********************************************",
-        }
-    )
+    session = auth_flows.start()
     return AuthResponse(
-        session_id="****-***-*******************************-**=",
-        url=f"https://account.hololive.net/v1/ep/auth?{query}",
+        session_id=session.session_id,
+        url=f"https://account.hololive.net/v1/ep/auth?{auth_flows.authorization_request(session).query()}",
     )
 
 
-@litestar.get("/v2/auth/callback", summary="/v2/auth/callback", status_code=status_codes.HTTP_302_FOUND)
+@litestar.get(
+    "/v2/auth/callback",
+    summary="/v2/auth/callback",
+    status_code=status_codes.HTTP_302_FOUND,
+    exclude_from_auth=True,
+)
 async def v2__auth__callback(
     *,
     code: Annotated[str, Parameter()],
@@ -82,22 +93,36 @@ async def v2__auth__callback(
     return Redirect(f"holoplus:///signup?{query}", status_code=status_codes.HTTP_302_FOUND)
 
 
-@litestar.post("/v2/auth/token", summary="/v2/auth/token", status_code=status_codes.HTTP_200_OK)
+@litestar.post(
+    "/v2/auth/token",
+    summary="/v2/auth/token",
+    status_code=status_codes.HTTP_200_OK,
+    exclude_from_auth=True,
+    raises=[InvalidAuthCodeException],
+)
 async def v2__auth__token(
     data: Annotated[AuthTokenRequest, Body()],
+    *,
+    auth_flows: AuthFlowStore,
+    tokens: TokenIssuer,
 ) -> AuthTokenResponse:
     """
     IMPORTANT: This returns **Firebase** token, you will need to convert it to Holoplus one.
     See `/v2/auth` for more info.
+
+    The code must be issued for the session: `state` must match, and the code challenge of the code
+    must be S256 of the code verifier of the session. Sessions and codes can be used only once.
     """
-    return AuthTokenResponse(token="JWT-TOKEN-PLACEHOLDER")
+    user_id = auth_flows.exchange(session_id=data.session_id, state=data.state, code=data.code)
+    if user_id is None:
+        raise InvalidAuthCodeException()
+    return AuthTokenResponse(token=tokens.mint(user_id, "custom"))
 
 
 @litestar.get("/v2/me/communities", summary="/v2/me/communities")
 async def v2__me__communities(
     *,
     limit: Annotated[int | None, Parameter(examples=[Example(value=30)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
 ) -> CommunitiesResponse:
     return CommunitiesResponse(
         items=[
@@ -112,51 +137,17 @@ async def v2__me__communities(
 async def v2__banners(
     *,
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> BannersResponse:
-    return BannersResponse(
-        top=[
-            BANNERS_MAP[uuid.UUID("fc7f7724-f78f-40be-8594-aa0e107dd303")],
-            BANNERS_MAP[uuid.UUID("6b1791c7-a0bf-4020-82ec-2dc7e8b5d004")],
-            BANNERS_MAP[uuid.UUID("22f6a0b0-5781-4747-997d-3d204b906c71")],
-            BANNERS_MAP[uuid.UUID("198d15b6-4c76-496a-97bb-32bf0969e4e8")],
-            BANNERS_MAP[uuid.UUID("be074072-5f83-41d4-bd99-5431e1c5b588")],
-            BANNERS_MAP[uuid.UUID("92b93efd-6739-4e3b-a0cc-1cf90088b882")],
-        ],
-        middle=[
-            BANNERS_MAP[uuid.UUID("7D68B380-402E-47D9-83AD-31B382DC3D39")],
-            BANNERS_MAP[uuid.UUID("1F821127-860D-4D09-909F-7F10339D56CA")],
-        ],
-    )
+    return fixtures.response("v2__banners")
 
 
 @litestar.get("/v2/modules", summary="/v2/modules")
 async def v2__modules(
     *,
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> ModulesResponse:
-    return ModulesResponse(
-        items=[
-            MODULES_MAP[uuid.UUID("b91175fc-8190-4dde-8e92-01d58ed48f46")],
-            MODULES_MAP[uuid.UUID("01bd333b-d391-4ee6-9d82-01b05cdcb445")],
-            MODULES_MAP[uuid.UUID("928633f8-124a-4243-b3c4-e5897399815f")],
-            MODULES_MAP[uuid.UUID("a6318273-c147-2a63-d7e5-5f0e01ab433b")],
-            MODULES_MAP[uuid.UUID("7f4c63df-8929-443a-914f-4b2d07e3d21a")],
-            MODULES_MAP[uuid.UUID("a5ac4bf0-237d-464b-9907-adae3bc5b019")],
-            MODULES_MAP[uuid.UUID("59f67c37-66bc-4235-8036-115262c08da5")],
-            MODULES_MAP[uuid.UUID("6cb7b74b-b112-40b6-9722-e06047c5e049")],
-            MODULES_MAP[uuid.UUID("fa7f1c33-e007-4562-b855-1bcaa1b3b819")],
-            MODULES_MAP[uuid.UUID("a96b53bf-5045-4a83-b279-024b0215d574")],
-            MODULES_MAP[uuid.UUID("723d3431-4be7-4361-9cf3-9a753fc65215")],
-            MODULES_MAP[uuid.UUID("ac05ae70-9a4f-11ee-8a54-f2115885f867")],
-            MODULES_MAP[uuid.UUID("17ca5776-f868-4b2d-b394-bdf1799203b1")],
-            MODULES_MAP[uuid.UUID("7322442b-cb31-4c1c-962b-d1b59c01898c")],
-            MODULES_MAP[uuid.UUID("18da6526-7edb-4066-ad63-4b5e84b01d0e")],
-            MODULES_MAP[uuid.UUID("29478ced-12dc-4980-8291-f719084a6ab7")],
-            MODULES_MAP[uuid.UUID("caeafa55-adf4-4784-8691-b3cfb93082ff")],
-            MODULES_MAP[uuid.UUID("f85251e5-2fff-4447-8120-575786170e20")],
-        ],
-    )
+    return fixtures.response("v2__modules")
 
 
 @litestar.get("/v2/groups/{group_id:uuid}", summary="/v2/groups/{group_id:uuid}", raises=[GroupNotFoundException])
@@ -165,10 +156,10 @@ async def v2__group(
     group_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("e9171551-cb2a-483e-8a77-fdffba8e632b"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> Group:
-    if group_id in GROUPS_MAP:
-        return GROUPS_MAP[group_id]
+    if response := fixtures.response("v2__groups", group_id):
+        return response
 
     raise GroupNotFoundException()
 
@@ -179,10 +170,10 @@ async def v2__unit(
     unit_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("ebe86ce6-0013-46ff-b787-b1e49a6a1bcb"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> Unit:
-    if unit_id in UNITS_MAP:
-        return UNITS_MAP[unit_id]
+    if response := fixtures.response("v2__units", unit_id):
+        return response
 
     raise UnitNotFoundException()
 
@@ -4,6 +4,7 @@ import itertools
 import pathlib
 import uuid
 
+from holoplus_mocked_api.lazy import LazyMap, lazy_directory_map
 from holoplus_mocked_api.v2.models import (
     Banner,
     Channel,
@@ -29,11 +30,47 @@ _banners_response = BannersResponse.load_json(ROOT_PATH / "banners.json")
 BANNERS: list[Banner] = [*_banners_response.top, *_banners_response.middle]
 BANNERS_MAP: dict[uuid.UUID, Banner] = {x.id: x for x in BANNERS}
 
+BANNERS_RESPONSE = BannersResponse(
+    top=[
+        BANNERS_MAP[uuid.UUID("fc7f7724-f78f-40be-8594-aa0e107dd303")],
+        BANNERS_MAP[uuid.UUID("6b1791c7-a0bf-4020-82ec-2dc7e8b5d004")],
+        BANNERS_MAP[uuid.UUID("22f6a0b0-5781-4747-997d-3d204b906c71")],
+        BANNERS_MAP[uuid.UUID("198d15b6-4c76-496a-97bb-32bf0969e4e8")],
+        BANNERS_MAP[uuid.UUID("be074072-5f83-41d4-bd99-5431e1c5b588")],
+        BANNERS_MAP[uuid.UUID("92b93efd-6739-4e3b-a0cc-1cf90088b882")],
+    ],
+    middle=[
+        BANNERS_MAP[uuid.UUID("7D68B380-402E-47D9-83AD-31B382DC3D39")],
+        BANNERS_MAP[uuid.UUID("1F821127-860D-4D09-909F-7F10339D56CA")],
+    ],
+)
+
 MODULES: list[Module] = [*ModulesResponse.load_json(ROOT_PATH / "modules.json").items]
 MODULES_MAP: dict[uuid.UUID, Module] = {x.id: x for x in MODULES}
 
-GROUPS: list[Group] = [Group.load_json(group_path) for group_path in (ROOT_PATH / "groups").iterdir()]
-GROUPS_MAP: dict[uuid.UUID, Group] = {x.id: x for x in GROUPS}
+MODULES_RESPONSE = ModulesResponse(
+    items=[
+        MODULES_MAP[uuid.UUID("b91175fc-8190-4dde-8e92-01d58ed48f46")],
+        MODULES_MAP[uuid.UUID("01bd333b-d391-4ee6-9d82-01b05cdcb445")],
+        MODULES_MAP[uuid.UUID("928633f8-124a-4243-b3c4-e5897399815f")],
+        MODULES_MAP[uuid.UUID("a6318273-c147-2a63-d7e5-5f0e01ab433b")],
+        MODULES_MAP[uuid.UUID("7f4c63df-8929-443a-914f-4b2d07e3d21a")],
+        MODULES_MAP[uuid.UUID("a5ac4bf0-237d-464b-9907-adae3bc5b019")],
+        MODULES_MAP[uuid.UUID("59f67c37-66bc-4235-8036-115262c08da5")],
+        MODULES_MAP[uuid.UUID("6cb7b74b-b112-40b6-9722-e06047c5e049")],
+        MODULES_MAP[uuid.UUID("fa7f1c33-e007-4562-b855-1bcaa1b3b819")],
+        MODULES_MAP[uuid.UUID("a96b53bf-5045-4a83-b279-024b0215d574")],
+        MODULES_MAP[uuid.UUID("723d3431-4be7-4361-9cf3-9a753fc65215")],
+        MODULES_MAP[uuid.UUID("ac05ae70-9a4f-11ee-8a54-f2115885f867")],
+        MODULES_MAP[uuid.UUID("17ca5776-f868-4b2d-b394-bdf1799203b1")],
+        MODULES_MAP[uuid.UUID("7322442b-cb31-4c1c-962b-d1b59c01898c")],
+        MODULES_MAP[uuid.UUID("18da6526-7edb-4066-ad63-4b5e84b01d0e")],
+        MODULES_MAP[uuid.UUID("29478ced-12dc-4980-8291-f719084a6ab7")],
+        MODULES_MAP[uuid.UUID("caeafa55-adf4-4784-8691-b3cfb93082ff")],
+        MODULES_MAP[uuid.UUID("f85251e5-2fff-4447-8120-575786170e20")],
+    ],
+)
+
+GROUPS_MAP: LazyMap[uuid.UUID, Group] | None = lazy_directory_map(ROOT_PATH / "groups", Group.load_json)
 
-UNITS: list[Unit] = [Unit.load_json(unit_path) for unit_path in (ROOT_PATH / "units").iterdir()]
-UNITS_MAP: dict[uuid.UUID, Unit] = {x.id: x for x in UNITS}
+UNITS_MAP: LazyMap[uuid.UUID, Unit] | None = lazy_directory_map(ROOT_PATH / "units", Unit.load_json)
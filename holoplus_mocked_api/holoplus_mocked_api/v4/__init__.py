@@ -3,10 +3,12 @@ from __future__ import annotations
 import litestar
 from litestar.types import ControllerRouterHandler
 
-from .threads import ROUTES as THREADS_ROUTES
-from .stream_events import ROUTES as STREAM_EVENTS_ROUTES
-from .talent_channel import ROUTES as TALENT_CHANNEL_ROUTES
-from .comments import ROUTES as COMMENTS_ROUTES
+from holoplus_mocked_api.fixtures import FixtureRoute
+
+from .threads import ROUTES as THREADS_ROUTES, FIXTURE_ROUTES as THREADS_FIXTURE_ROUTES
+from .stream_events import ROUTES as STREAM_EVENTS_ROUTES, FIXTURE_ROUTES as STREAM_EVENTS_FIXTURE_ROUTES
+from .talent_channel import ROUTES as TALENT_CHANNEL_ROUTES, FIXTURE_ROUTES as TALENT_CHANNEL_FIXTURE_ROUTES
+from .comments import ROUTES as COMMENTS_ROUTES, FIXTURE_ROUTES as COMMENTS_FIXTURE_ROUTES
 from .channels import ROUTES as CHANNELS_ROUTES
 from .reactions import ROUTES as REACTIONS_ROUTES
 from .pins import ROUTES as PINS_ROUTES
@@ -27,3 +29,10 @@ ROUTES: list[ControllerRouterHandler] = [
         ],
     )
 ]
+
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    *THREADS_FIXTURE_ROUTES,
+    *STREAM_EVENTS_FIXTURE_ROUTES,
+    *TALENT_CHANNEL_FIXTURE_ROUTES,
+    *COMMENTS_FIXTURE_ROUTES,
+]
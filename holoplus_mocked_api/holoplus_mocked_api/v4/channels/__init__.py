@@ -8,8 +8,10 @@ from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.clock import VirtualClock
 from holoplus_mocked_api.enums import FilterLanguages
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureStore
 
 from .models import ChannelsIdUpdatedThreadResponse
 
@@ -25,9 +27,17 @@ async def v4__channels__id__updated_thread(
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("18eec09c-ce17-4f50-bfc6-8b47457882ed"))])
     ],
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
+    clock: VirtualClock,
 ) -> ChannelsIdUpdatedThreadResponse:
-    return ChannelsIdUpdatedThreadResponse(channel_id=channel_id, updated_at=1757152800)
+    """Channel was last updated when its newest thread (that already exists at virtual time) was created"""
+    updated_at = 0  # channels without captured threads were never updated
+    if paginator := fixtures.paginator("threads__updated", channel_id):
+        now = clock.time()
+        updated_at = next(
+            (item.created_at for item in paginator.filter(filter_language).items if item.created_at <= now), 0
+        )
+    return ChannelsIdUpdatedThreadResponse(channel_id=channel_id, updated_at=updated_at)
 
 
 ROUTES: list[ControllerRouterHandler] = [
@@ -9,22 +9,48 @@ from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
 from holoplus_mocked_api.enums import FilterLanguages
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute, FixtureStore
+from holoplus_mocked_api.pagination import content_languages
+from holoplus_mocked_api.v4.reactions.counters import ReactionCounters
 
-from .models import CommentContent, CommentsMeResponse, CommentsResponse
+from .models import Comment, CommentContent, CommentsMeResponse, CommentsResponse
 
 ROOT_PATH = pathlib.Path(__file__).parent
 DATA_PATH = ROOT_PATH / "data"
 
 
+def _comment_languages(item: Comment) -> set[str]:
+    return content_languages(item.original_language, item.translations)
+
+
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(
+        name="comments__me",
+        path=DATA_PATH / "comments__me.json",
+        model=CommentsMeResponse,
+    ),
+    FixtureRoute(
+        name="comments__popular",
+        path=DATA_PATH,
+        prefix="comments__popular__",
+        model=CommentsResponse,
+        key=uuid.UUID,
+        paginated=True,
+        languages=_comment_languages,
+    ),
+]
+
+
 @litestar.get("/v4/comments/me", summary="/v4/comments/me")
 async def v4__comments__me(
     *,
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> CommentsMeResponse:
-    return CommentsMeResponse.load_json(DATA_PATH / "comments__me.json")
+    return fixtures.response("comments__me")
 
 
 @litestar.get("/v4/comments/popular", summary="/v4/comments/popular", raises=[HoloplusNotFoundException])
@@ -35,11 +61,14 @@ async def v4__comments__popular(
     ],
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> CommentsResponse:
-    json_path = DATA_PATH / f"comments__popular__{thread_id}.json"
-    if json_path.exists():
-        return CommentsResponse.load_json(json_path)
+    if limit is None and filter_language is None:
+        if response := fixtures.response("comments__popular", thread_id):
+            return response
+    elif paginator := fixtures.paginator("comments__popular", thread_id):
+        paginator = paginator.filter(filter_language)
+        return CommentsResponse(items=paginator.page(limit=limit or len(paginator)).items)
     raise HoloplusNotFoundException()
 
 
@@ -50,13 +79,16 @@ async def v4__comments__popular(
 )
 async def v4__comments__id__contents(
     *,
-    comment_id: Annotated[str, Parameter(examples=[Example(value=uuid.UUID("cfdd2f8b-ee45-4e3f-b4df-c150f826e224"))])],
-    token: Annotated[str, Parameter(header="authorization")],
+    comment_id: Annotated[
+        uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("cfdd2f8b-ee45-4e3f-b4df-c150f826e224"))])
+    ],
+    request: AuthRequest,
+    reactions: ReactionCounters,
 ) -> CommentContent:
     return CommentContent(
         comment_total=0,
-        reaction_total=6,
-        user_reacted_count=0,
+        reaction_total=reactions.total(comment_id),
+        user_reacted_count=reactions.user_count(comment_id, request.user),
     )
 
 
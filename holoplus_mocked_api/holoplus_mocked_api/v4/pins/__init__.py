@@ -9,9 +9,12 @@ from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
 from holoplus_mocked_api.enums import FilterLanguages
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
 
+from .store import PinStore
+
 
 @litestar.post(
     "/v4/pins/{record_id:uuid}",
@@ -21,11 +24,15 @@ from holoplus_mocked_api.exceptions import HoloplusNotFoundException
 )
 async def v4__pins__id(
     *,
-    record_id: Annotated[str, Parameter(examples=[Example(value=uuid.UUID("2f495a98-f005-4ef4-b164-be922b823b42"))])],
+    record_id: Annotated[
+        uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("2f495a98-f005-4ef4-b164-be922b823b42"))])
+    ],
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    pins: PinStore,
 ) -> None:
     """Returns empty response"""
+    pins[request.user].pin(record_id)
     return None
 
 
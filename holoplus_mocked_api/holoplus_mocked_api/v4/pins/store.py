@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import uuid
+from typing import Callable, Iterator, Protocol, Sequence, TypeVar
+
+from litestar.datastructures import State
+
+from holoplus_mocked_api.users import UserDirectory
+
+T = TypeVar("T", bound="PinnableItem")
+
+
+class PinnableItem(Protocol):
+    @property
+    def id(self) -> uuid.UUID: ...
+
+
+class Pins:
+    """
+    Pinned records (channels or threads) of one user, most recently pinned first.
+
+    Kept in insertion-ordered dict, so pinning and membership checks are O(1),
+    and iteration is in pin order without sorting.
+    """
+
+    def __init__(self) -> None:
+        self._record_ids: dict[uuid.UUID, None] = {}
+
+    def __len__(self) -> int:
+        return len(self._record_ids)
+
+    def __contains__(self, record_id: object) -> bool:
+        return record_id in self._record_ids
+
+    def __iter__(self) -> Iterator[uuid.UUID]:
+        return reversed(self._record_ids)
+
+    def pin(self, record_id: uuid.UUID) -> None:
+        """Pins the record, pinning already pinned record moves it to the top"""
+        self._record_ids.pop(record_id, None)
+        self._record_ids[record_id] = None
+
+
+class PinStore:
+    """
+    Pins of all users, kept in their sessions (see `UserDirectory`).
+    Same as favorites, all operations are synchronous and need no locking.
+    """
+
+    def __init__(self, users: UserDirectory) -> None:
+        self.users = users
+
+    def __getitem__(self, user_id: uuid.UUID) -> Pins:
+        return self.users[user_id].setdefault(Pins)
+
+    def get(self, user_id: uuid.UUID) -> Pins | None:
+        """Returns `None` for users without any pins, so that listings can skip pin handling"""
+        session = self.users.get(user_id)
+        pins = session.get(Pins) if session is not None else None
+        return pins if pins else None
+
+
+def pinned_first(
+    items: Sequence[T],
+    pinned: Callable[[uuid.UUID], T | None],
+    pins: Pins,
+    *,
+    first_page: bool = True,
+    limit: int | None = None,
+) -> list[T]:
+    """
+    Moves pinned items to the start of listing.
+
+    Pinned items are looked up with `pinned` in the whole listing (not only in the current page), e.g. by index
+    of the listing, so only the pins and the returned items are visited. Lookup of filtered listing must return
+    `None` for items that don't match the filters. Pinned items are prepended only to the first page,
+    and skipped on all pages.
+
+    With `limit`, the merged page is trimmed to `limit` items. The page of `items` should then be `len(pins)`
+    items longer, so that it's still full after the pinned items are skipped.
+    """
+    pinned_items = [item for record_id in pins if (item := pinned(record_id)) is not None] if first_page else []
+    merged = pinned_items + [item for item in items if item.id not in pins]
+    return merged if limit is None else merged[:limit]
+
+
+def provide_pin_store(state: State) -> PinStore:
+    return state.pin_store
@@ -9,8 +9,10 @@ from litestar.params import Body, Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
 
+from .counters import ReactionCounters
 from .models import ReactionsContentsPostRequest
 
 
@@ -23,10 +25,14 @@ from .models import ReactionsContentsPostRequest
 async def v4__reactions__contents__id(
     data: Annotated[ReactionsContentsPostRequest, Body()],
     *,
-    record_id: Annotated[str, Parameter(examples=[Example(value=uuid.UUID("b2ee47b9-2225-4c25-990a-3c6430531c8e"))])],
-    token: Annotated[str, Parameter(header="authorization")],
+    record_id: Annotated[
+        uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("b2ee47b9-2225-4c25-990a-3c6430531c8e"))])
+    ],
+    request: AuthRequest,
+    reactions: ReactionCounters,
 ) -> None:
     """Returns empty response"""
+    reactions.react(record_id, request.user, data.reaction_count)
     return None
 
 
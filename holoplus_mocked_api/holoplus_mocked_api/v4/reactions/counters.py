@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import collections
+import uuid
+
+from litestar.datastructures import State
+
+from holoplus_mocked_api.users import UserDirectory
+
+
+class UserReactions(collections.Counter[uuid.UUID]):
+    """Reaction counts of one user by record id, kept in user session"""
+
+
+class ReactionCounters:
+    """
+    Reaction counters of threads and comments, keyed by record id. Reaction counts of every user
+    are kept in their session (see `UserDirectory`), and are forgotten when the session is evicted.
+
+    All handlers are async and run on one event loop, and `react` doesn't await between updating
+    the user count and the total, so the counters are plain `Counter`s without locks.
+    """
+
+    def __init__(self, users: UserDirectory) -> None:
+        self.users = users
+        self.totals: collections.Counter[uuid.UUID] = collections.Counter()
+
+    def __len__(self) -> int:
+        return len(self.totals)
+
+    def react(self, record_id: uuid.UUID, user_id: uuid.UUID, count: int = 1) -> int:
+        """Adds `count` reactions of the user to the record, returns new reaction total of the record"""
+        self.users[user_id].setdefault(UserReactions)[record_id] += count
+        self.totals[record_id] += count
+        return self.totals[record_id]
+
+    def total(self, record_id: uuid.UUID) -> int:
+        return self.totals.get(record_id, 0)
+
+    def user_count(self, record_id: uuid.UUID, user_id: uuid.UUID) -> int:
+        session = self.users.get(user_id)
+        user_reactions = session.get(UserReactions) if session is not None else None
+        return user_reactions.get(record_id, 0) if user_reactions is not None else 0
+
+
+def provide_reaction_counters(state: State) -> ReactionCounters:
+    return state.reaction_counters
@@ -6,5 +6,5 @@ import msgspec
 
 
 class ReactionsContentsPostRequest(msgspec.Struct, kw_only=True):
-    reaction_count: Annotated[int, msgspec.Meta(examples=[1])] = msgspec.field()
+    reaction_count: Annotated[int, msgspec.Meta(examples=[1], ge=1)] = msgspec.field()
     target_type: Annotated[str, msgspec.Meta(examples=["comment"])] = msgspec.field()
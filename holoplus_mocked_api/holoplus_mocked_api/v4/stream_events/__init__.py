@@ -1,36 +1,53 @@
 from __future__ import annotations
 
-import pathlib
-from typing import Annotated, Literal
+from typing import Annotated
 
 import litestar
 from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute
+from holoplus_mocked_api.talents import favorite_talent_ids
+from holoplus_mocked_api.users import UserDirectory
 
+from .data import ROOT_PATH as DATA_PATH
 from .models import (
     StreamEventsResponse,
     StreamEvent,
 )
+from .schedule import Plan, StreamSchedule
 
-ROOT_PATH = pathlib.Path(__file__).parent
-DATA_PATH = ROOT_PATH / "data"
+# served from `StreamSchedule`, that is built from these fixtures, see `StreamSchedule.from_store()`
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(
+        name="stream_events__plan",
+        path=DATA_PATH,
+        prefix="stream_events__",
+        model=StreamEventsResponse,
+    ),
+    FixtureRoute(
+        name="stream_events",
+        path=DATA_PATH / "stream_events",
+        model=StreamEvent,
+    ),
+]
 
 
 @litestar.get("/v4/stream_events", summary="/v4/stream_events")
 async def v4__stream_events(
     *,
     fav_talent_filter: Annotated[bool, Parameter(examples=[Example(value=False)])],
-    plan: Annotated[Literal["past", "current", "future"], Parameter(examples=[Example(value="past")])],
-    token: Annotated[str, Parameter(header="authorization")],
+    plan: Annotated[Plan, Parameter(examples=[Example(value="past")])],
+    request: AuthRequest,
+    schedule: StreamSchedule,
+    users: UserDirectory,
 ) -> StreamEventsResponse:
-    if plan == "past":
-        return StreamEventsResponse.load_json(DATA_PATH / "stream_events__past.json")
-    if plan == "current":
-        return StreamEventsResponse.load_json(DATA_PATH / "stream_events__current.json")
-    return StreamEventsResponse.load_json(DATA_PATH / "stream_events__future.json")
+    if fav_talent_filter:
+        return schedule.listing(plan, talent_ids=favorite_talent_ids(users, request.user))
+    return schedule.response(plan)
 
 
 @litestar.get(
@@ -39,11 +56,10 @@ async def v4__stream_events(
 async def v4__stream_events__id(
     *,
     event_id: Annotated[str, Parameter(examples=[Example(value="7tyO2iBAdAA")])],
-    token: Annotated[str, Parameter(header="authorization")],
+    schedule: StreamSchedule,
 ) -> StreamEvent:
-    json_path = DATA_PATH / "stream_events" / f"{event_id}.json"
-    if json_path.exists():
-        return StreamEvent.load_json(json_path)
+    if event := schedule.event(event_id):
+        return event
     raise HoloplusNotFoundException()
 
 
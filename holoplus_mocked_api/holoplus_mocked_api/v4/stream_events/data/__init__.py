@@ -0,0 +1,5 @@
+from __future__ import annotations
+
+import pathlib
+
+ROOT_PATH = pathlib.Path(__file__).parent
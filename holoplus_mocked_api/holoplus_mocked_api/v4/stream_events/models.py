@@ -106,7 +106,7 @@ class StreamEvent(msgspec.Struct, kw_only=True):
     ] = msgspec.field()
     reaction_total: Annotated[int, msgspec.Meta(examples=[0])] = msgspec.field()
     streamer: Annotated[StreamEventStreamer, msgspec.Meta()] = msgspec.field()
-    talents: Annotated[StreamEventTalent, msgspec.Meta()] = msgspec.field()
+    talents: Annotated[list[StreamEventTalent], msgspec.Meta()] = msgspec.field()
     created_at: Annotated[int, msgspec.Meta(examples=[0])] = msgspec.field()
     updated_at: Annotated[int, msgspec.Meta(examples=[0])] = msgspec.field()
 
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import bisect
+import itertools
+import math
+import os
+import time
+import uuid
+from typing import Any, Collection, Iterable, Literal, Mapping, Protocol, Self
+
+import msgspec
+from litestar.datastructures import State
+
+from holoplus_mocked_api.clock import VirtualClock
+from holoplus_mocked_api.fixtures import Fixture, FixtureStore
+from holoplus_mocked_api.talents import TalentIndex
+
+from .models import StreamEvent, StreamEventsResponse, StreamEventsResponseItem
+
+Plan = Literal["past", "current", "future"]
+
+PLANS: tuple[Plan, ...] = ("past", "current", "future")
+
+# fixture routes the schedule is built from, see `StreamSchedule.from_store()`
+FIXTURE_ROUTE_NAMES = frozenset({"stream_events__plan", "stream_events"})
+
+# How long are streams live, the captured data have only their start times
+STREAM_DURATION = int(os.getenv("HOLOPLUS_STREAM_DURATION", default="7200"))
+
+
+class _CapturedItem(Protocol):
+    @property
+    def date_time(self) -> int: ...
+
+    @property
+    def is_live(self) -> bool: ...
+
+
+def capture_time(items: Iterable[_CapturedItem]) -> int | None:
+    """Capture time of stream events is the start of the latest stream that was live when captured"""
+    return max((item.date_time for item in items if item.is_live), default=None)
+
+
+class ScheduledEvent(msgspec.Struct, kw_only=True, frozen=True):
+    item: StreamEventsResponseItem
+    """Listing item with `is_live=False`"""
+    live_item: StreamEventsResponseItem
+    """Listing item with `is_live=True`"""
+    detail: StreamEvent | None
+    start: int
+    end: int
+    """Stream is live from `start` (inclusive) until `end` (exclusive)"""
+    talent_ids: frozenset[uuid.UUID]
+
+    def is_live(self, now: float) -> bool:
+        return self.start <= now < self.end
+
+
+def _merge_items(
+    items: Iterable[StreamEventsResponseItem], details: Mapping[str, StreamEvent]
+) -> dict[str, StreamEventsResponseItem]:
+    """Listing items by id, items of events with details are created from the details"""
+    items_map = {item.id: item for item in items}
+    for event_id, event_detail in details.items():
+        items_map[event_id] = StreamEventsResponseItem(
+            **{field: getattr(event_detail, field) for field in StreamEventsResponseItem.__struct_fields__}
+        )
+    return items_map
+
+
+def _scheduled_events(
+    items_map: Mapping[str, StreamEventsResponseItem],
+    details: Mapping[str, StreamEvent],
+    *,
+    duration: int,
+    captured_at: int,
+) -> list[ScheduledEvent]:
+    events = []
+    for event_id, item in items_map.items():
+        start = item.date_time
+        if item.is_live:
+            end = max(start, captured_at) + duration
+        elif start <= captured_at:
+            end = min(start + duration, captured_at)
+        else:
+            end = start + duration
+
+        detail = details.get(event_id)
+        events.append(
+            ScheduledEvent(
+                item=msgspec.structs.replace(item, is_live=False),
+                live_item=msgspec.structs.replace(item, is_live=True),
+                detail=detail,
+                start=start,
+                end=end,
+                talent_ids=frozenset(talent.id for talent in detail.talents) if detail else frozenset(),
+            )
+        )
+    return events
+
+
+def stream_events_data(fixtures: FixtureStore) -> tuple[list[StreamEventsResponseItem], dict[str, StreamEvent]]:
+    """Captured `plan=past|current|future` listing items and stream event details from the fixtures"""
+    items: list[StreamEventsResponseItem] = []
+    for plan in PLANS:
+        if (response := fixtures.get("stream_events__plan", plan)) is not None:
+            items.extend(response.items)
+    details = {str(event_id): event for event_id, event in fixtures.values("stream_events")}
+    return items, details
+
+
+class StreamSchedule:
+    """
+    All stream events sorted by `date_time`, with the interval in which they are live.
+
+    Schedule time is the time of the server virtual clock, that by default starts at the time when the data
+    was captured (so that right after start the listings are the same as the captured ones) and then moves,
+    so streams go live and end.
+
+    - `future` events are the ones after start time found by bisect
+    - `current` events are found in the window of events that started at most the longest stream duration ago
+    - `past` events are the ones before that window, plus the ended ones from the window
+
+    Listings only change when some event starts or ends, so the responses are cached (with their ETag
+    and compressed bodies) until the next such boundary.
+    """
+
+    def __init__(
+        self,
+        events: Iterable[ScheduledEvent],
+        *,
+        captured_at: int,
+        duration: int = STREAM_DURATION,
+        clock: VirtualClock | None = None,
+        encoded: bool = False,
+        compression_encodings: tuple[str, ...] = (),
+    ) -> None:
+        self.captured_at = captured_at
+        self.duration = duration
+        self.clock = VirtualClock(start=captured_at) if clock is None else clock
+        self.encoded = encoded
+        self.compression_encodings = compression_encodings
+        self.fixtures: FixtureStore | None = None
+        """Store the schedule was built from, see `reload()`"""
+        self._set_events(events)
+
+    def _set_events(self, events: Iterable[ScheduledEvent]) -> None:
+        # everything is replaced at once, so requests never see only some of the changes
+        events = sorted(events, key=lambda event: (event.start, event.item.id))
+        self._events_map = {event.item.id: event for event in events}
+        self._starts = [event.start for event in events]
+        self._boundaries = sorted({event.start for event in events} | {event.end for event in events})
+        self._max_duration = max((event.end - event.start for event in events), default=0)
+        self._talent_index = TalentIndex(events, lambda event: event.talent_ids)
+        self._responses: dict[Plan, tuple[float, float, Fixture]] = {}
+        self._events = events
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    @classmethod
+    def load(
+        cls,
+        items: Iterable[StreamEventsResponseItem],
+        details: Mapping[str, StreamEvent],
+        *,
+        duration: int = STREAM_DURATION,
+        captured_at: int | None = None,
+        clock: VirtualClock | None = None,
+        encoded: bool = False,
+        compression_encodings: tuple[str, ...] = (),
+    ) -> Self:
+        """
+        Creates schedule from captured listing items and stream event details, details are used when both exist.
+
+        See `capture_time` for the default capture time. Streams that were live
+        stay live for `duration` after it, other streams are live for `duration` from their start,
+        but streams that started before the capture ended before it.
+        """
+        items_map = _merge_items(items, details)
+        if captured_at is None:
+            captured_at = capture_time(items_map.values())
+        if captured_at is None:
+            captured_at = int(time.time())
+
+        return cls(
+            _scheduled_events(items_map, details, duration=duration, captured_at=captured_at),
+            captured_at=captured_at,
+            duration=duration,
+            clock=clock,
+            encoded=encoded,
+            compression_encodings=compression_encodings,
+        )
+
+    @classmethod
+    def from_store(
+        cls,
+        fixtures: FixtureStore,
+        *,
+        duration: int = STREAM_DURATION,
+        clock: VirtualClock | None = None,
+    ) -> Self:
+        """
+        Creates schedule from the stream event fixtures (see `FIXTURE_ROUTE_NAMES`) of the store,
+        responses are encoded and compressed the same way as the fixtures
+        """
+        items, details = stream_events_data(fixtures)
+        schedule = cls.load(
+            items,
+            details,
+            duration=duration,
+            clock=clock,
+            encoded=fixtures.encoded,
+            compression_encodings=fixtures.compression_encodings,
+        )
+        schedule.fixtures = fixtures
+        return schedule
+
+    def reload(self, route_names: Collection[str]) -> None:
+        """
+        Rebuilds the schedule from the store it was created from (see `from_store()`), when any of its fixture routes
+        changed. Capture time (and so the virtual clock) stays the same.
+        """
+        if self.fixtures is None or FIXTURE_ROUTE_NAMES.isdisjoint(route_names):
+            return
+        items, details = stream_events_data(self.fixtures)
+        self._set_events(
+            _scheduled_events(
+                _merge_items(items, details), details, duration=self.duration, captured_at=self.captured_at
+            )
+        )
+
+    def now(self) -> float:
+        return self.clock.time()
+
+    def events(
+        self, plan: Plan, *, now: float | None = None, talent_ids: Collection[uuid.UUID] | None = None
+    ) -> list[ScheduledEvent]:
+        """Events of the plan, past events newest first, and other events oldest first"""
+        now = self.now() if now is None else now
+        started = bisect.bisect_right(self._starts, now)
+
+        if plan == "future":
+            if talent_ids is None:
+                return self._events[started:]
+            return list(self._talent_index.filter(talent_ids, started))
+
+        # events before the window certainly ended, events in the window may still be live
+        ended = bisect.bisect_right(self._starts, now - self._max_duration)
+        window = self._events[ended:started]
+        if talent_ids is not None:
+            window = [event for event in window if not event.talent_ids.isdisjoint(talent_ids)]
+
+        if plan == "current":
+            return [event for event in window if event.end > now]
+
+        if talent_ids is None:
+            past = self._events[:ended]
+        else:
+            positions = itertools.takewhile(lambda position: position < ended, self._talent_index.positions(talent_ids))
+            past = [self._events[position] for position in positions]
+        past.extend(event for event in window if event.end <= now)
+        past.reverse()
+        return past
+
+    def listing(
+        self, plan: Plan, *, now: float | None = None, talent_ids: Collection[uuid.UUID] | None = None
+    ) -> StreamEventsResponse:
+        now = self.now() if now is None else now
+        return StreamEventsResponse(
+            items=[
+                event.live_item if event.is_live(now) else event.item
+                for event in self.events(plan, now=now, talent_ids=talent_ids)
+            ]
+        )
+
+    def response(self, plan: Plan) -> Any:
+        """Listing of the plan as response that should be returned from handler, cached until next start or end"""
+        now = self.now()
+        if (cached := self._responses.get(plan)) is not None and cached[0] <= now < cached[1]:
+            return cached[2].response()
+
+        index = bisect.bisect_right(self._boundaries, now)
+        valid_from = self._boundaries[index - 1] if index > 0 else -math.inf
+        valid_until = self._boundaries[index] if index < len(self._boundaries) else math.inf
+
+        fixture = Fixture.from_value(
+            self.listing(plan, now=now), encoded=self.encoded, compression_encodings=self.compression_encodings
+        )
+        self._responses[plan] = (valid_from, valid_until, fixture)
+        return fixture.response()
+
+    def event(self, event_id: str) -> StreamEvent | None:
+        """Stream event details with `is_live` at current schedule time"""
+        event = self._events_map.get(event_id)
+        if event is None or event.detail is None:
+            return None
+
+        is_live = event.is_live(self.now())
+        if event.detail.is_live == is_live:
+            return event.detail
+        return msgspec.structs.replace(event.detail, is_live=is_live)
+
+
+def provide_stream_schedule(state: State) -> StreamSchedule:
+    return state.stream_schedule
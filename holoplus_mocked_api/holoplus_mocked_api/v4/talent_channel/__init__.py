@@ -5,32 +5,99 @@ import pathlib
 from typing import Annotated
 
 import litestar
+import msgspec
 from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute, FixtureStore
+from holoplus_mocked_api.v4.pins.store import PinStore, pinned_first
 
 from .models import (
     TalentChannelChannelsResponse,
     TalentChannelCommentsResponse,
     TalentChannelThreadsResponse,
 )
+from .models.talent_channel__threads import TalentChannelThreadsResponseChannel
 
 ROOT_PATH = pathlib.Path(__file__).parent
 DATA_PATH = ROOT_PATH / "data"
 
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(
+        name="talent-channel__channels",
+        path=DATA_PATH / "talent-channel__channels.json",
+        model=TalentChannelChannelsResponse,
+        indexed=True,
+    ),
+    FixtureRoute(
+        name="talent-channel__threads__newest",
+        path=DATA_PATH / "talent-channel__threads__newest",
+        model=TalentChannelThreadsResponse,
+        key=uuid.UUID,
+        paginated=True,
+        newest_first=True,
+    ),
+    FixtureRoute(
+        name="talent-channel__comments__popular",
+        path=DATA_PATH / "talent-channel__comments__popular",
+        model=TalentChannelCommentsResponse,
+        key=uuid.UUID,
+        paginated=True,
+    ),
+    FixtureRoute(
+        name="talent-channel__comments__newest",
+        path=DATA_PATH / "talent-channel__comments__newest",
+        model=TalentChannelCommentsResponse,
+        key=uuid.UUID,
+        paginated=True,
+        newest_first=True,
+    ),
+]
+
 
 class TalentNotFoundException(HoloplusNotFoundException):
     holoplus_detail = "failed to get talents: talent not found"
 
 
+def _thread_channel(fixtures: FixtureStore, channel_id: uuid.UUID) -> TalentChannelThreadsResponseChannel:
+    """Channel of threads listing, from the channels index, so the listing body doesn't have to be decoded"""
+    if (channel := (fixtures.index("talent-channel__channels") or {}).get(channel_id)) is not None:
+        # TODO: verify, all channels of `/v4/talent-channel/channels` were talent channels so far
+        return TalentChannelThreadsResponseChannel(
+            id=channel.id, name=channel.name, channel_type="talent", icon_url=channel.icon_url
+        )
+    return fixtures.get("talent-channel__threads__newest", channel_id).channel
+
+
+def _talent_channel_comments(
+    name: str, fixtures: FixtureStore, thread_id: uuid.UUID, limit: int | None, cursor: str | None
+) -> TalentChannelCommentsResponse:
+    if limit is None and cursor is None:
+        if response := fixtures.response(name, thread_id):
+            return response
+    elif paginator := fixtures.paginator(name, thread_id):
+        page = paginator.page(limit=limit or 20, cursor=cursor)
+        return TalentChannelCommentsResponse(items=page.items, next_cursor=page.next_cursor or msgspec.UNSET)
+
+    return TalentChannelCommentsResponse(items=[])
+
+
 @litestar.get("/v4/talent-channel/channels", summary="/v4/talent-channel/channels")
 async def v4__talent_channel__channels(
     *,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    fixtures: FixtureStore,
+    pins: PinStore,
 ) -> TalentChannelChannelsResponse:
-    return TalentChannelChannelsResponse.load_json(DATA_PATH / "talent-channel__channels.json")
+    if (user_pins := pins.get(request.user)) is None:
+        return fixtures.response("talent-channel__channels")
+
+    # index keeps the order of the fixture, so the fixture body doesn't have to be decoded
+    index = fixtures.index("talent-channel__channels") or {}
+    return TalentChannelChannelsResponse(items=pinned_first(list(index.values()), index.get, user_pins))
 
 
 @litestar.get(
@@ -42,12 +109,23 @@ async def v4__talent_channel__threads__newest(
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("7f237193-e0f7-4127-af78-9f5c255069ac"))])
     ],
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    fixtures: FixtureStore,
+    pins: PinStore,
 ) -> TalentChannelThreadsResponse:
-    if channel_id == uuid.UUID("7f237193-e0f7-4127-af78-9f5c255069ac"):
-        return TalentChannelThreadsResponse.load_json(
-            DATA_PATH / "talent-channel__threads__newest" / "7f237193-e0f7-4127-af78-9f5c255069ac.json"
-        )
+    user_pins = pins.get(request.user)
+    if limit is None and user_pins is None:
+        if response := fixtures.response("talent-channel__threads__newest", channel_id):
+            return response
+    elif paginator := fixtures.paginator("talent-channel__threads__newest", channel_id):
+        limit = limit or len(paginator)
+        if user_pins is None:
+            items = paginator.page(limit=limit).items
+        else:
+            # pinned threads are skipped in the page, so it's longer to still fill the limit
+            items = paginator.page(limit=limit + len(user_pins)).items
+            items = pinned_first(items, paginator.get, user_pins, limit=limit)
+        return TalentChannelThreadsResponse(items=items, channel=_thread_channel(fixtures, channel_id))
     raise TalentNotFoundException()
 
 
@@ -58,13 +136,22 @@ async def v4__talent_channel__comments__popular(
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2"))])
     ],
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    cursor: Annotated[
+        str | None,
+        Parameter(
+            examples=[
+                Example(
+                    value=(
+                        "#en#1757126335#96d6d699-98e0-4e07-8c61-152c4ee88a13:"
+                        "1757126335#96d6d699-98e0-4e07-8c61-152c4ee88a13"
+                    )
+                )
+            ]
+        ),
+    ] = None,
+    fixtures: FixtureStore,
 ) -> TalentChannelCommentsResponse:
-    json_path = DATA_PATH / "talent-channel__comments__popular" / f"{thread_id}.json"
-    if json_path.exists():
-        return TalentChannelCommentsResponse.load_json(json_path)
-
-    return TalentChannelCommentsResponse(items=[])
+    return _talent_channel_comments("talent-channel__comments__popular", fixtures, thread_id, limit, cursor)
 
 
 @litestar.get("/v4/talent-channel/comments/newest", summary="/v4/talent-channel/comments/newest")
@@ -74,13 +161,22 @@ async def v4__talent_channel__comments__newest(
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2"))])
     ],
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    cursor: Annotated[
+        str | None,
+        Parameter(
+            examples=[
+                Example(
+                    value=(
+                        "#en#1757126335#96d6d699-98e0-4e07-8c61-152c4ee88a13:"
+                        "1757126335#96d6d699-98e0-4e07-8c61-152c4ee88a13"
+                    )
+                )
+            ]
+        ),
+    ] = None,
+    fixtures: FixtureStore,
 ) -> TalentChannelCommentsResponse:
-    json_path = DATA_PATH / "talent-channel__comments__newest" / f"{thread_id}.json"
-    if json_path.exists():
-        return TalentChannelCommentsResponse.load_json(json_path)
-
-    return TalentChannelCommentsResponse(items=[])
+    return _talent_channel_comments("talent-channel__comments__newest", fixtures, thread_id, limit, cursor)
 
 
 ROUTES: list[ControllerRouterHandler] = [
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import functools
 import uuid
 import pathlib
 from typing import Annotated
@@ -10,35 +11,89 @@ from litestar.params import Parameter
 from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
+from holoplus_mocked_api.auth import AuthRequest
+from holoplus_mocked_api.clock import VirtualClock
 from holoplus_mocked_api.enums import FilterLanguages
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
-
+from holoplus_mocked_api.fixtures import FixtureRoute, FixtureStore
+from holoplus_mocked_api.pagination import content_languages
+from holoplus_mocked_api.talents import favorite_talent_ids
+from holoplus_mocked_api.users import UserDirectory
+from holoplus_mocked_api.v4.pins.store import PinStore, pinned_first
+from holoplus_mocked_api.v4.reactions.counters import ReactionCounters
+from holoplus_mocked_api.v5.data import thread_filters
+
+from .favorites import FavoritesStore
 from .models import (
     ThreadsFavoriteResponse,
     ThreadsMeResponse,
     ThreadContent,
     ThreadsModulesResponse,
     ThreadsUpdatedResponse,
+    ThreadsUpdatedResponseItem,
+    ThreadsModulesResponseItem,
 )
 
 ROOT_PATH = pathlib.Path(__file__).parent
 DATA_PATH = ROOT_PATH / "data"
 
 
+def _thread_languages(item: ThreadsModulesResponseItem | ThreadsUpdatedResponseItem) -> set[str]:
+    """Listings have only thread ids, languages are taken from the thread itself"""
+    if filters := thread_filters(item.id):
+        return content_languages(filters.original_language, filters.translations)
+    return set()
+
+
+def _thread_talents(item: ThreadsModulesResponseItem | ThreadsUpdatedResponseItem) -> list[uuid.UUID]:
+    if filters := thread_filters(item.id):
+        return [talent.id for talent in filters.talents]
+    return []
+
+
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(
+        name="threads__modules",
+        path=DATA_PATH / "threads__modules",
+        model=ThreadsModulesResponse,
+        key=uuid.UUID,
+        paginated=True,
+        newest_first=True,
+        languages=_thread_languages,
+        talents=_thread_talents,
+        depends_on=("v5__threads",),
+    ),
+    FixtureRoute(
+        name="threads__updated",
+        path=DATA_PATH / "threads__updated",
+        model=ThreadsUpdatedResponse,
+        key=uuid.UUID,
+        paginated=True,
+        languages=_thread_languages,
+        talents=_thread_talents,
+        depends_on=("v5__threads",),
+    ),
+]
+
+
 @litestar.get("/v4/threads/favorite", summary="/v4/threads/favorite")
 async def v4__threads__favorite(
     *,
     limit: Annotated[int | None, Parameter(examples=[Example(value=30)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    cursor: Annotated[
+        str | None, Parameter(examples=[Example(value="1757125645#c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2")])
+    ] = None,
+    request: AuthRequest,
+    favorites: FavoritesStore,
 ) -> ThreadsFavoriteResponse:
-    return ThreadsFavoriteResponse(items=[], next_cursor=None)
+    page = favorites[request.user].page(limit=limit or 30, cursor=cursor)
+    return ThreadsFavoriteResponse(items=page.items, next_cursor=page.next_cursor)
 
 
 @litestar.get("/v4/threads/me", summary="/v4/threads/me")
 async def v4__threads__me(
     *,
     limit: Annotated[int | None, Parameter(examples=[Example(value=30)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
 ) -> ThreadsMeResponse:
     return ThreadsMeResponse(items=[])
 
@@ -53,11 +108,24 @@ async def v4__threads__modules(
     fav_talent_filter: Annotated[bool, Parameter(examples=[Example(value=False)])],
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
     limit: Annotated[int | None, Parameter(examples=[Example(value=5)], ge=1, le=30)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    cursor: Annotated[
+        str | None, Parameter(examples=[Example(value="1757077200#1a913d1f-6c90-48de-b015-a9749546fc02")])
+    ] = None,
+    request: AuthRequest,
+    fixtures: FixtureStore,
+    users: UserDirectory,
 ) -> ThreadsModulesResponse:
-    json_path = DATA_PATH / "threads__modules" / f"{module_id}.json"
-    if json_path.exists():
-        return ThreadsModulesResponse.load_json(json_path)
+    if limit is None and cursor is None and filter_language is None and not fav_talent_filter:
+        if response := fixtures.response("threads__modules", module_id):
+            return response
+    elif paginator := fixtures.paginator("threads__modules", module_id):
+        paginator = paginator.filter(filter_language)
+        page = paginator.page(
+            limit=limit or (5 if cursor else len(paginator)),
+            cursor=cursor,
+            talent_ids=favorite_talent_ids(users, request.user) if fav_talent_filter else None,
+        )
+        return ThreadsModulesResponse(items=page.items, next_cursor=page.next_cursor or "")
     raise HoloplusNotFoundException()
 
 
@@ -72,11 +140,29 @@ async def v4__threads__updated(
     filter_language: Annotated[FilterLanguages | None, Parameter(examples=[Example(value="en")])] = None,
     limit: Annotated[int | None, Parameter(examples=[Example(value=20)], ge=1, le=30)] = None,
     offset: Annotated[int | None, Parameter(examples=[Example(value=0)], ge=0)] = None,
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    fixtures: FixtureStore,
+    pins: PinStore,
+    users: UserDirectory,
 ) -> ThreadsUpdatedResponse:
-    json_path = DATA_PATH / "threads__updated" / f"{channel_id}.json"
-    if json_path.exists():
-        return ThreadsUpdatedResponse.load_json(json_path)
+    user_pins = pins.get(request.user)
+    if limit is None and offset is None and filter_language is None and not fav_talent_filter and user_pins is None:
+        if response := fixtures.response("threads__updated", channel_id):
+            return response
+    elif paginator := fixtures.paginator("threads__updated", channel_id):
+        paginator = paginator.filter(filter_language)
+        talent_ids = favorite_talent_ids(users, request.user) if fav_talent_filter else None
+        if limit is None and offset is None:
+            page = paginator.page(limit=len(paginator), talent_ids=talent_ids)
+        else:
+            page = paginator.page(limit=limit or 20, offset=offset or 0, talent_ids=talent_ids)
+
+        items = page.items
+        if user_pins is not None:
+            # pinned threads must match the same filters as the listing
+            pinned = functools.partial(paginator.get, talent_ids=talent_ids)
+            items = pinned_first(items, pinned, user_pins, first_page=not offset)
+        return ThreadsUpdatedResponse(items=items, has_next_items=page.has_next_items)
     raise HoloplusNotFoundException()
 
 
@@ -90,13 +176,15 @@ async def v4__threads__id__contents(
     thread_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("e1272fb1-38bc-4e29-aeb8-f8a9443c3340"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    favorites: FavoritesStore,
+    reactions: ReactionCounters,
 ) -> ThreadContent:
     return ThreadContent(
         reply_count=3,
-        reaction_total=3057,
-        user_reacted_count=0,
-        is_favorite=False,
+        reaction_total=reactions.total(thread_id),
+        user_reacted_count=reactions.user_count(thread_id, request.user),
+        is_favorite=favorites.is_favorite(request.user, thread_id),
     )
 
 
@@ -111,9 +199,12 @@ async def v4__threads__id__favorite__post(
     thread_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    favorites: FavoritesStore,
+    clock: VirtualClock,
 ) -> None:
     """Returns empty response"""
+    favorites[request.user].add(thread_id, created_at=int(clock.time()))
     return None
 
 
@@ -128,9 +219,11 @@ async def v4__threads__id__favorite__delete(
     thread_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    request: AuthRequest,
+    favorites: FavoritesStore,
 ) -> None:
     """Returns empty response"""
+    favorites[request.user].remove(thread_id)
     return None
 
 
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import uuid
+from typing import Iterator
+
+from litestar.datastructures import State
+
+from holoplus_mocked_api.pagination import Page, format_cursor, parse_cursor
+from holoplus_mocked_api.users import UserDirectory
+
+from .models import ThreadsFavoriteResponseItem
+
+
+class _Node:
+    __slots__ = ("item", "key", "newer", "older")
+
+    def __init__(self, item: ThreadsFavoriteResponseItem) -> None:
+        self.item = item
+        self.key = (item.created_at, item.id.int)
+        self.newer: _Node | None = None
+        self.older: _Node | None = None
+
+
+class Favorites:
+    """
+    Favorite threads of one user, in linked list ordered by `(created_at, id)` (newest first) and indexed by thread id.
+
+    New favorites are always the newest (only favorites added in the same second can be before them),
+    so adding and removing is O(1) and the order is kept without sorting.
+    Pages continue directly from the node of the cursor item, so every page is O(limit).
+    """
+
+    def __init__(self) -> None:
+        self._nodes: dict[uuid.UUID, _Node] = {}
+        self._newest: _Node | None = None
+        self._oldest: _Node | None = None
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, thread_id: object) -> bool:
+        return thread_id in self._nodes
+
+    def __iter__(self) -> Iterator[ThreadsFavoriteResponseItem]:
+        node = self._newest
+        while node is not None:
+            yield node.item
+            node = node.older
+
+    def add(self, thread_id: uuid.UUID, created_at: int) -> bool:
+        """Adds thread as the newest favorite, returns `False` if it was already favorite"""
+        if thread_id in self._nodes:
+            return False
+
+        # `created_at` can't go back in time (even when the clock is moved back), so that the list stays ordered
+        if self._newest is not None:
+            created_at = max(created_at, self._newest.item.created_at)
+
+        node = _Node(ThreadsFavoriteResponseItem(id=thread_id, created_at=created_at))
+
+        # find the newer neighbour, can be only favorite with the same `created_at` and larger id
+        newer = None
+        older = self._newest
+        while older is not None and older.key > node.key:
+            newer, older = older, older.older
+
+        node.newer, node.older = newer, older
+        if newer is not None:
+            newer.older = node
+        else:
+            self._newest = node
+        if older is not None:
+            older.newer = node
+        else:
+            self._oldest = node
+
+        self._nodes[thread_id] = node
+        return True
+
+    def remove(self, thread_id: uuid.UUID) -> bool:
+        """Returns `False` if the thread was not favorite"""
+        node = self._nodes.pop(thread_id, None)
+        if node is None:
+            return False
+
+        if node.newer is not None:
+            node.newer.older = node.older
+        else:
+            self._newest = node.older
+        if node.older is not None:
+            node.older.newer = node.newer
+        else:
+            self._oldest = node.newer
+        return True
+
+    def _after_cursor(self, cursor: str) -> _Node | None:
+        created_at, thread_id = parse_cursor(cursor)
+        if node := self._nodes.get(thread_id):
+            return node.older
+
+        # cursor item was removed, find the first older item from the oldest end
+        key = (created_at, thread_id.int)
+        node = self._oldest
+        while node is not None and node.newer is not None and node.newer.key < key:
+            node = node.newer
+        return node if node is not None and node.key < key else None
+
+    def page(self, *, limit: int, cursor: str | None = None) -> Page[ThreadsFavoriteResponseItem]:
+        node = self._after_cursor(cursor) if cursor else self._newest
+
+        items: list[ThreadsFavoriteResponseItem] = []
+        while node is not None and len(items) < limit:
+            items.append(node.item)
+            node = node.older
+
+        return Page(items=items, next_cursor=format_cursor(items[-1]) if node is not None and items else None)
+
+
+class FavoritesStore:
+    """
+    Favorites of all users, kept in their sessions (see `UserDirectory`).
+
+    All operations are synchronous and don't yield to the event loop, so concurrent requests
+    (in single worker) can't see or leave the favorites in inconsistent state, and no locking is needed.
+    """
+
+    def __init__(self, users: UserDirectory) -> None:
+        self.users = users
+
+    def __getitem__(self, user_id: uuid.UUID) -> Favorites:
+        return self.users[user_id].setdefault(Favorites)
+
+    def is_favorite(self, user_id: uuid.UUID, thread_id: uuid.UUID) -> bool:
+        session = self.users.get(user_id)
+        favorites = session.get(Favorites) if session is not None else None
+        return favorites is not None and thread_id in favorites
+
+
+def provide_favorites_store(state: State) -> FavoritesStore:
+    return state.favorites_store
@@ -19,7 +19,9 @@ class ThreadsFavoriteResponseItem(msgspec.Struct, kw_only=True):
 
 class ThreadsFavoriteResponse(msgspec.Struct, kw_only=True):
     items: Annotated[list[ThreadsFavoriteResponseItem], Parameter()] = msgspec.field()
-    next_cursor: Annotated[None, Parameter()] = msgspec.field()  # TODO: unknown type
+    next_cursor: Annotated[
+        str | None, Parameter(examples=[Example(value="1757125645#c7186c9b-6c6d-4269-b4cf-5a2bb97acbd2")])
+    ] = msgspec.field()
 
 
 class ThreadsMeResponse(msgspec.Struct, kw_only=True):
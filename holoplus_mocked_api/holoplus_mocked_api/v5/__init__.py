@@ -9,9 +9,14 @@ from litestar.openapi.spec import Example
 from litestar.types import ControllerRouterHandler
 
 from holoplus_mocked_api.exceptions import HoloplusNotFoundException
+from holoplus_mocked_api.fixtures import FixtureRoute, FixtureStore
 
 from .models import Thread
-from .data import THREADS_MAP
+from .data import ROOT_PATH as DATA_PATH, THREADS_MAP
+
+FIXTURE_ROUTES: list[FixtureRoute] = [
+    FixtureRoute(name="v5__threads", path=DATA_PATH / "threads", model=Thread, key=uuid.UUID, values=THREADS_MAP),
+]
 
 
 class ThreadFoundException(HoloplusNotFoundException):
@@ -24,10 +29,10 @@ async def v5__thread(
     thread_id: Annotated[
         uuid.UUID, Parameter(examples=[Example(value=uuid.UUID("e1272fb1-38bc-4e29-aeb8-f8a9443c3340"))])
     ],
-    token: Annotated[str, Parameter(header="authorization")],
+    fixtures: FixtureStore,
 ) -> Thread:
-    if thread_id in THREADS_MAP:
-        return THREADS_MAP[thread_id]
+    if response := fixtures.response("v5__threads", thread_id):
+        return response
 
     raise ThreadFoundException()
 
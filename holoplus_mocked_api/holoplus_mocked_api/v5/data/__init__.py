@@ -1,11 +1,34 @@
 from __future__ import annotations
 
+import functools
 import pathlib
 import uuid
 
-from holoplus_mocked_api.v5.models import Thread
+from holoplus_mocked_api.lazy import LAZY_FIXTURES_MAXSIZE, LazyMap, lazy_directory_map
+from holoplus_mocked_api.v5.models import Thread, ThreadFilters
 
 ROOT_PATH = pathlib.Path(__file__).parent
+THREADS_PATH = ROOT_PATH / "threads"
 
-THREADS: list[Thread] = [Thread.load_json(unit_path) for unit_path in (ROOT_PATH / "threads").iterdir()]
-THREADS_MAP: dict[uuid.UUID, Thread] = {x.id: x for x in THREADS}
+THREADS_MAP: LazyMap[uuid.UUID, Thread] | None = lazy_directory_map(THREADS_PATH, Thread.load_json)
+
+
+def thread_filters(thread_id: uuid.UUID) -> ThreadFilters | None:
+    """
+    Languages and talents of the thread, that thread listings are indexed by.
+
+    Decoded from the thread file, not taken from `THREADS_MAP`, so that indexing listings doesn't decode
+    the whole threads or churn the lazy map cache. Cached by file modification time, so changed files are
+    decoded again when the listings are reindexed.
+    """
+    path = THREADS_PATH / f"{thread_id}.json"
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _load_thread_filters(path, mtime_ns)
+
+
+@functools.lru_cache(maxsize=LAZY_FIXTURES_MAXSIZE)
+def _load_thread_filters(path: pathlib.Path, mtime_ns: int) -> ThreadFilters:
+    return ThreadFilters.load_json(path)
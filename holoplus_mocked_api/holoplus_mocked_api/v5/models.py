@@ -162,3 +162,19 @@ class Thread(msgspec.Struct, kw_only=True):
     @classmethod
     def load_json(cls, path: pathlib.Path) -> Self:
         return litestar.serialization.decode_json(path.read_bytes(), cls, strict=True)
+
+
+class ThreadFilterTalent(msgspec.Struct, kw_only=True):
+    id: uuid.UUID
+
+
+class ThreadFilters(msgspec.Struct, kw_only=True):
+    """Only the fields of `Thread` that listings are filtered by, other fields are skipped when decoding"""
+
+    talents: list[ThreadFilterTalent]
+    original_language: str | None = None
+    translations: dict[str, msgspec.Raw] | msgspec.UnsetType = msgspec.UNSET
+
+    @classmethod
+    def load_json(cls, path: pathlib.Path) -> Self:
+        return msgspec.json.decode(path.read_bytes(), type=cls)
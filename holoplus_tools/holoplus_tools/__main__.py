@@ -2,47 +2,135 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
+import contextlib
+import json
 import logging
+import pathlib
+import sys
+import time
+from typing import Iterable
 
-from .auth import auth_token, refresh_token
+from .auth import (
+    HOLOPLUS_BASE_URL,
+    HOLOPLUS_REFRESH_CONCURRENCY,
+    AuthTokenResponse,
+    HostMap,
+    auth_token,
+    create_session,
+    refresh_token,
+    refresh_tokens,
+)
 from .cookies import (
     COOKIES_FROM_BROWSER_HELP,
     COOKIES_FROM_BROWSER_METAVAR,
+    HOLOPLUS_COOKIE_CACHE,
     extract_cookie_jar_from_browser,
 )
+from .token_cache import HOLOPLUS_TOKEN_CACHE, TokenCache
 
 _logger = logging.getLogger(__name__)
 
 
+async def print_refreshed_tokens(tokens: Iterable[str], concurrency: int, hosts: HostMap) -> None:
+    """Refreshes the tokens, prints results as NDJSON (one line per token) as they complete"""
+    done = failed = 0
+    start = time.perf_counter()
+    async for result in refresh_tokens(tokens, concurrency=concurrency, hosts=hosts):
+        print(json.dumps(result, default=str), flush=True)
+        done += 1
+        failed += result["error"] is not None
+
+    _logger.info("Refreshed %d tokens (%d failed) in %.2fs", done - failed, failed, time.perf_counter() - start)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser()
     parser.add_argument("--auth-token", action="store_true")
     parser.add_argument("--refresh-token", default=None)
+    parser.add_argument(
+        "--refresh-tokens-file",
+        default=None,
+        metavar="PATH",
+        help="Refresh all tokens of the file (one per line, - for stdin) and print results as NDJSON "
+        "(index of the line, response or error)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=HOLOPLUS_REFRESH_CONCURRENCY,
+        help="Max number of tokens refreshed at once with --refresh-tokens-file",
+    )
     parser.add_argument(
         "--cookies-from-browser",
         default="chrome",
         metavar=COOKIES_FROM_BROWSER_METAVAR,
         help=COOKIES_FROM_BROWSER_HELP,
     )
+    parser.add_argument(
+        "--base-url",
+        default=HOLOPLUS_BASE_URL,
+        help="Base URL of mocked API (e.g. http://localhost:8000) used instead of the production hosts",
+    )
+    parser.add_argument(
+        "--account",
+        default=None,
+        help="Name of the account the --auth-token is cached for (default is the --cookies-from-browser value)",
+    )
+    parser.add_argument(
+        "--token-cache",
+        default=HOLOPLUS_TOKEN_CACHE,
+        metavar="PATH",
+        help="File where the --auth-token tokens are cached until they expire",
+    )
+    parser.add_argument("--no-token-cache", action="store_true", help="Always get new --auth-token")
+    parser.add_argument(
+        "--no-cookie-cache",
+        action="store_true",
+        help="Always extract the cookies from browser, even if the browser cookie database didn't change",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Log debug messages (e.g. timings)")
     args = parser.parse_args()
 
     logging.basicConfig()
     _logger.setLevel(logging.INFO)
+    if args.verbose:
+        _logger.setLevel(logging.DEBUG)
+        logging.getLogger("holoplus_tools").setLevel(logging.DEBUG)
+
+    hosts = HostMap.mocked(args.base_url) if args.base_url else HostMap()
+
+    with create_session() as session:
+        if args.auth_token:
+
+            def authenticate() -> AuthTokenResponse:
+                _logger.info("Loading cookies from %r", args.cookies_from_browser)
+                cookie_jar = extract_cookie_jar_from_browser(
+                    args.cookies_from_browser, cache=None if args.no_cookie_cache else HOLOPLUS_COOKIE_CACHE
+                )
 
-    if args.auth_token:
-        _logger.info("Loading cookies from %r", args.cookies_from_browser)
-        cookie_jar = extract_cookie_jar_from_browser(args.cookies_from_browser)
+                _logger.info("Getting auth token. This will fail if you are not signed in browser.")
+                return auth_token(cookie_jar=cookie_jar, session=session, hosts=hosts)
 
-        _logger.info("Getting auth token. This will fail if you are not signed in browser.")
-        auth_response = auth_token(cookie_jar=cookie_jar)
+            if args.no_token_cache:
+                print(authenticate())
+            else:
+                # tokens of mocked API and of production are cached separately
+                account = f"{args.account or args.cookies_from_browser}@{hosts.url('https://api.holoplus.com')}"
+                print(TokenCache(args.token_cache).token(account, authenticate, session=session, hosts=hosts))
 
-        print(auth_response)
+        if args.refresh_token:
+            _logger.info("Refreshing token.")
+            refresh_response = refresh_token(token=args.refresh_token, session=session, hosts=hosts)
 
-    if args.refresh_token:
-        _logger.info("Refreshing token.")
-        refresh_response = refresh_token(token=args.refresh_token)
+            print(refresh_response)
 
-        print(refresh_response)
+    if args.refresh_tokens_file:
+        _logger.info("Refreshing tokens from %r.", args.refresh_tokens_file)
+        with contextlib.ExitStack() as stack:
+            path = args.refresh_tokens_file
+            lines = sys.stdin if path == "-" else stack.enter_context(pathlib.Path(path).open(encoding="utf-8"))
+            asyncio.run(print_refreshed_tokens(lines, args.concurrency, hosts))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+# ruff: noqa: T201
+"""
+Benchmark of the full five-step auth flow (see `auth_token`) with and without connection pooling.
+
+Runs against mocked API, start it first and pass its URL:
+
+    litestar --app holoplus_mocked_api.app:create_app run --port 8000
+    python -m holoplus_tools.benchmark --base-url http://localhost:8000
+
+Local mocked API is plain HTTP, so the savings are TCP handshakes only, with HTTPS every new connection
+also pays for TLS handshake.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import logging
+import socket
+import time
+from typing import Iterator
+
+import requests.cookies
+import urllib3.connection
+
+from .auth import HOLOPLUS_BASE_URL, HostMap, auth_token, create_session
+
+
+@contextlib.contextmanager
+def _count_connections() -> Iterator[list[int]]:
+    """Counts new TCP connections (HTTPS connections create them the same way)"""
+    counter = [0]
+    new_conn = urllib3.connection.HTTPConnection._new_conn
+
+    def counting_new_conn(self: urllib3.connection.HTTPConnection) -> socket.socket:
+        counter[0] += 1
+        return new_conn(self)
+
+    urllib3.connection.HTTPConnection._new_conn = counting_new_conn  # type: ignore[method-assign]
+    try:
+        yield counter
+    finally:
+        urllib3.connection.HTTPConnection._new_conn = new_conn  # type: ignore[method-assign]
+
+
+def benchmark(hosts: HostMap, repeat: int) -> None:
+    cookie_jar = requests.cookies.RequestsCookieJar()
+
+    print(f"{'session':<10} {'flows':>6} {'connections':>12} {'per flow':>10}")
+    for name in ("one-off", "pooled"):
+        with create_session() as session, _count_connections() as connections:
+            if name == "one-off":
+                # new connection for every request, like separate `requests.request` calls
+                session.headers["Connection"] = "close"
+
+            start = time.perf_counter()
+            for _ in range(repeat):
+                auth_token(cookie_jar, session=session, hosts=hosts)
+            duration = time.perf_counter() - start
+
+            print(f"{name:<10} {repeat:>6} {connections[0]:>12} {duration / repeat * 1000:>8.2f}ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default=HOLOPLUS_BASE_URL or "http://localhost:8000", help="Mocked API")
+    parser.add_argument("--repeat", type=int, default=200, help="Number of auth flows")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    benchmark(HostMap.mocked(args.base_url), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
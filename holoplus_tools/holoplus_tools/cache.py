@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import pathlib
+import tempfile
+from typing import Any
+
+_logger = logging.getLogger(__name__)
+
+# Directory of the cache files (tokens, cookies)
+HOLOPLUS_CACHE_DIR = pathlib.Path(
+    os.getenv("HOLOPLUS_CACHE_DIR")
+    or pathlib.Path(os.getenv("XDG_CACHE_HOME") or pathlib.Path.home() / ".cache") / "holoplus_tools"
+)
+
+
+def load_json(path: pathlib.Path) -> Any | None:
+    """Content of the cache file, `None` if it doesn't exist or is corrupted"""
+    try:
+        with path.open(encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except ValueError:
+        _logger.warning("Cache file %s is corrupted, ignoring it", path)
+        return None
+
+
+def save_json(path: pathlib.Path, data: Any) -> None:
+    """Replaces the cache file atomically, the file is readable only by the owner (it contains secrets)"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # mkstemp creates the file readable only by the owner
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.")
+    tmp_path = pathlib.Path(tmp_name)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        tmp_path.replace(path)
+    except BaseException:
+        tmp_path.unlink()
+        raise
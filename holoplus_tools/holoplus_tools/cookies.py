@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import contextlib
+import http.cookiejar
 import logging
+import os
+import pathlib
 import re
+import tempfile
+import time
+from typing import Any, Sequence
 
 import requests.cookies
 import yt_dlp.cookies
 
+from .cache import HOLOPLUS_CACHE_DIR, load_json, save_json
+
 _logger = logging.getLogger(__name__)
+
+# Domains (with their subdomains) whose cookies are extracted, the auth flow sends cookies only to these
+COOKIE_DOMAINS = ("hololive.net", "holoplus.com")
+
+# File where the extracted cookies are cached until the browser cookie database is modified
+HOLOPLUS_COOKIE_CACHE = os.getenv("HOLOPLUS_COOKIE_CACHE") or str(HOLOPLUS_CACHE_DIR / "cookies.json")
+
 COOKIES_FROM_BROWSER_METAVAR = "BROWSER[+KEYRING][:PROFILE][::CONTAINER]"
 COOKIES_FROM_BROWSER_HELP = (
     "The name of the browser to load cookies from. "
@@ -50,18 +66,177 @@ class PatchedYDLLogger(yt_dlp.cookies.YDLLogger):
         _logger.error(message)
 
 
-def extract_cookie_jar_from_browser(cookies_from_browser: str) -> requests.cookies.RequestsCookieJar:
+def extract_cookie_jar_from_browser(
+    cookies_from_browser: str,
+    *,
+    domains: Sequence[str] = COOKIE_DOMAINS,
+    cache: str | os.PathLike[str] | None = HOLOPLUS_COOKIE_CACHE,
+) -> requests.cookies.RequestsCookieJar:
+    """
+    Extracts cookies of the domains (and their subdomains) from the browser.
+
+    Chromium cookies of other domains are not even read, so they are not decrypted. Extracted cookies are cached
+    in `cache` file until the browser cookie database is modified, so repeated runs skip the extraction
+    (and the keyring) entirely. Safari cookies are not cached.
+    """
+    start = time.perf_counter()
     browser_name, profile, keyring, container = parse_cookies_from_browser_arg(cookies_from_browser)
-    yt_dlp_cookie_jar: yt_dlp.cookies.YoutubeDLCookieJar = yt_dlp.cookies.extract_cookies_from_browser(
-        browser_name=browser_name, profile=profile, logger=PatchedYDLLogger(), keyring=keyring, container=container
-    )
+    logger = PatchedYDLLogger()
+    database = _cookie_database(browser_name, profile, logger)
+    cache_path = pathlib.Path(cache) if cache is not None and database is not None else None
+    cache_key = f"{cookies_from_browser}|{','.join(domains)}"
 
     cookie_jar = requests.cookies.RequestsCookieJar()
-    cookie_jar.update(yt_dlp_cookie_jar)
+    if cache_path is not None and database is not None:
+        cached = (load_json(cache_path) or {}).get(cache_key)
+        if cached is not None and cached["database"] == database and cached["version"] == _database_version(database):
+            for cookie in cached["cookies"]:
+                cookie_jar.set_cookie(requests.cookies.create_cookie(**cookie))
+            _logger.debug("Loaded %d cached cookies in %.3fs", len(cookie_jar), time.perf_counter() - start)
+            return cookie_jar
+
+    if browser_name in yt_dlp.cookies.CHROMIUM_BASED_BROWSERS and database is not None:
+        yt_dlp_cookie_jar = _extract_chrome_cookies(browser_name, profile, keyring, database, domains, logger)
+    else:
+        yt_dlp_cookie_jar = yt_dlp.cookies.extract_cookies_from_browser(
+            browser_name=browser_name, profile=profile, logger=logger, keyring=keyring, container=container
+        )
+    cookies = [cookie for cookie in yt_dlp_cookie_jar if _matches_domains(cookie.domain, domains)]
+    for cookie in cookies:
+        cookie_jar.set_cookie(cookie)
+    _logger.debug("Extracted %d cookies in %.3fs", len(cookie_jar), time.perf_counter() - start)
+
+    if cache_path is not None and database is not None:
+        # database is read before it's stat-ed, so cookies changed meanwhile invalidate the cache on next run
+        version = _database_version(database)
+        cache_data = load_json(cache_path) or {}
+        cache_data[cache_key] = {"database": database, "version": version, "cookies": list(map(_dump, cookies))}
+        save_json(cache_path, cache_data)
 
     return cookie_jar
 
 
+def _matches_domains(domain: str, domains: Sequence[str]) -> bool:
+    domain = domain.lstrip(".")
+    return any(domain == d or domain.endswith(f".{d}") for d in domains)
+
+
+def _database_version(database: str) -> list[int]:
+    stat = pathlib.Path(database).stat()
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _dump(cookie: http.cookiejar.Cookie) -> dict[str, Any]:
+    """Keyword arguments of `requests.cookies.create_cookie`"""
+    return {
+        "name": cookie.name,
+        "value": cookie.value,
+        "domain": cookie.domain,
+        "path": cookie.path,
+        "secure": cookie.secure,
+        "expires": cookie.expires,
+    }
+
+
+def _chrome_settings(browser_name: str, profile: str | None) -> tuple[dict[str, Any], str]:
+    """
+    Settings of Chromium based browser and the directory where its cookie database is searched.
+    Borrowed from yt-dlp.
+    """
+    config = yt_dlp.cookies._get_chromium_based_browser_settings(browser_name)
+
+    if profile is None:
+        search_root = config["browser_dir"]
+    elif yt_dlp.cookies._is_path(profile):
+        search_root = profile
+        config["browser_dir"] = os.path.dirname(profile) if config["supports_profiles"] else profile  # noqa: PTH120
+    elif config["supports_profiles"]:
+        search_root = os.path.join(config["browser_dir"], profile)  # noqa: PTH118
+    else:
+        _logger.error("%s does not support profiles", browser_name)
+        search_root = config["browser_dir"]
+
+    return config, search_root
+
+
+def _cookie_database(browser_name: str, profile: str | None, logger: PatchedYDLLogger) -> str | None:
+    """
+    Cookie database yt-dlp extracts the cookies from (of the most recently used profile), `None` for Safari.
+    Borrowed from yt-dlp.
+    """
+    if browser_name in yt_dlp.cookies.CHROMIUM_BASED_BROWSERS:
+        _, search_root = _chrome_settings(browser_name, profile)
+        database = yt_dlp.cookies._newest(yt_dlp.cookies._find_files(search_root, "Cookies", logger))
+    elif browser_name == "firefox":
+        browser_dirs = list(yt_dlp.cookies._firefox_browser_dirs())
+        if profile is None:
+            search_roots = browser_dirs
+        elif yt_dlp.cookies._is_path(profile):
+            search_roots = [profile]
+        else:
+            search_roots = [os.path.join(path, profile) for path in browser_dirs]  # noqa: PTH118
+        database = yt_dlp.cookies._newest(yt_dlp.cookies._firefox_cookie_dbs(search_roots))
+    else:
+        return None
+
+    if database is None:
+        raise FileNotFoundError(f"could not find {browser_name} cookies database")
+    return str(database)
+
+
+def _extract_chrome_cookies(
+    browser_name: str,
+    profile: str | None,
+    keyring: str | None,
+    database: str,
+    domains: Sequence[str],
+    logger: PatchedYDLLogger,
+) -> yt_dlp.cookies.YoutubeDLCookieJar:
+    """
+    Same as `yt_dlp.cookies.extract_cookies_from_browser` for Chromium based browsers, but only the cookies
+    of the domains are read from the database and decrypted.
+    Borrowed from yt-dlp.
+    """
+    config, _ = _chrome_settings(browser_name, profile)
+    _logger.debug('Extracting cookies from: "%s"', database)
+
+    jar = yt_dlp.cookies.YoutubeDLCookieJar()
+    failed_cookies = 0
+    with tempfile.TemporaryDirectory(prefix="holoplus_tools") as tmpdir:
+        cursor = yt_dlp.cookies._open_database_copy(database, tmpdir)
+        with contextlib.closing(cursor.connection):
+            meta_version = int(cursor.execute('SELECT value FROM meta WHERE key = "version"').fetchone()[0])
+            decryptor = yt_dlp.cookies.get_cookie_decryptor(
+                config["browser_dir"], config["keyring_name"], logger, keyring=keyring, meta_version=meta_version
+            )
+
+            cursor.connection.text_factory = bytes
+            column_names = yt_dlp.cookies._get_column_names(cursor, "cookies")
+            secure_column = "is_secure" if "is_secure" in column_names else "secure"
+            # `%.example.com` matches both `.example.com` and subdomains
+            where = " OR ".join("host_key = ? OR host_key LIKE ?" for _ in domains)
+            cursor.execute(
+                f"SELECT host_key, name, value, encrypted_value, path, expires_utc, {secure_column} "  # noqa: S608
+                f"FROM cookies WHERE {where}",
+                [param for domain in domains for param in (domain, f"%.{domain}")],
+            )
+            for line in cursor.fetchall():
+                _, cookie = yt_dlp.cookies._process_chrome_cookie(decryptor, *line)
+                if cookie:
+                    jar.set_cookie(cookie)
+                else:
+                    failed_cookies += 1
+
+    _logger.info(
+        "Extracted %d cookies of %s from %s (%d could not be decrypted)",
+        len(jar),
+        ", ".join(domains),
+        browser_name,
+        failed_cookies,
+    )
+    return jar
+
+
 def parse_cookies_from_browser_arg(cookies_from_browser: str) -> tuple[str, str | None, str | None, str | None]:
     """
     Parses cookies_from_browser argument.
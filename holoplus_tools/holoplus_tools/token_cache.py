@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextlib
+import logging
+import os
+import pathlib
+import time
+from typing import Callable, Iterator, TypedDict
+
+import requests
+
+from .auth import AuthTokenResponse, HostMap, RefreshTokenResponse, refresh_token
+from .cache import HOLOPLUS_CACHE_DIR, load_json, save_json
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+_logger = logging.getLogger(__name__)
+
+# File where the tokens are cached, by account
+HOLOPLUS_TOKEN_CACHE = os.getenv("HOLOPLUS_TOKEN_CACHE") or str(HOLOPLUS_CACHE_DIR / "tokens.json")
+
+# Seconds before the expiry when the cached token is refreshed
+HOLOPLUS_TOKEN_REFRESH_MARGIN = float(os.getenv("HOLOPLUS_TOKEN_REFRESH_MARGIN", default="300"))
+
+
+class CachedToken(TypedDict):
+    id_token: str
+    refresh_token: str
+    expires_at: float
+    """Unix time when the ID token expires"""
+
+
+class TokenCache:
+    """
+    ID and Refresh Tokens by account (any name, e.g. the browser profile the cookies are from) in JSON file.
+
+    Cached token is returned while it is valid for longer than `refresh_margin`, then it's refreshed
+    with its Refresh Token, and only when there is no token (or the Refresh Token is rejected) the account
+    is authenticated again. Expiry is absolute, computed from `expires_in` and the time of the request.
+
+    The whole lookup holds exclusive lock of `{path}.lock`, so parallel processes (e.g. CI jobs) wait for
+    each other and reuse the token instead of all authenticating at once. The file is replaced atomically
+    and readable only by the owner.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str] = HOLOPLUS_TOKEN_CACHE,
+        *,
+        refresh_margin: float = HOLOPLUS_TOKEN_REFRESH_MARGIN,
+    ) -> None:
+        self.path = pathlib.Path(path)
+        self.refresh_margin = refresh_margin
+
+    def token(
+        self,
+        account: str,
+        authenticate: Callable[[], AuthTokenResponse],
+        timeout: int = 30,
+        *,
+        session: requests.Session | None = None,
+        hosts: HostMap | None = None,
+    ) -> CachedToken:
+        """Returns valid token of the account, `authenticate` is called only when it can't be refreshed"""
+        with self._locked():
+            tokens = self._load()
+            now = time.time()
+            if (cached := tokens.get(account)) is not None and cached["expires_at"] - now > self.refresh_margin:
+                _logger.info("Using cached token of %r", account)
+                return cached
+
+            response: AuthTokenResponse | RefreshTokenResponse | None = None
+            if cached is not None:
+                _logger.info("Refreshing cached token of %r", account)
+                try:
+                    response = refresh_token(cached["refresh_token"], timeout, session=session, hosts=hosts)
+                except requests.HTTPError:
+                    _logger.warning("Cached Refresh Token of %r was rejected, authenticating again", account)
+            if response is None:
+                response = authenticate()
+
+            tokens[account] = cached = CachedToken(
+                id_token=response["id_token"],
+                refresh_token=response["refresh_token"],
+                expires_at=now + response["expires_in"],
+            )
+            self._save(tokens)
+            return cached
+
+    @contextlib.contextmanager
+    def _locked(self) -> Iterator[None]:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.with_name(f"{self.path.name}.lock").open("a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _load(self) -> dict[str, CachedToken]:
+        tokens: dict[str, CachedToken] = load_json(self.path) or {}
+        return tokens
+
+    def _save(self, tokens: dict[str, CachedToken]) -> None:
+        save_json(self.path, tokens)